@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Thin argparse front-end for scripted / per-video invocations.
+
+`genocide_detect.py` is the interactive CLI; this entry point skips the
+Typer + Rich import cost at start-up, which adds up when a batch driver
+shells out once per video.  Heavy modules are imported only by the
+sub-command that needs them (and Rich only with ``--pretty``).
+
+    python fast_cli.py extract <url-or-id> [--overwrite]
+    python fast_cli.py analyze <url-or-id> [--force-extract] [--force-analysis] [--pretty]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+
+def _emit(text: str, *, pretty: bool) -> None:
+    if pretty:
+        from rich import print_json
+
+        print_json(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def cmd_extract(args: argparse.Namespace) -> int:
+    from src.youtube_transcript import (
+        extract_video_id,
+        fetch_transcript,
+        save_transcript,
+        stored_transcript_path,
+    )
+
+    video_id = extract_video_id(args.url)
+    if not args.overwrite and (path := stored_transcript_path(video_id)) is not None:
+        sys.stdout.write(f"skipped {path}\n")  # already saved: no download
+        return 0
+    segments, language = fetch_transcript(video_id)
+    path, saved = save_transcript(
+        segments, video_id, transcript_language=language, overwrite=args.overwrite
+    )
+    sys.stdout.write(f"{'saved' if saved else 'skipped'} {path}\n")
+    return 0
+
+
+def cmd_analyze(args: argparse.Namespace) -> int:
+    import asyncio
+
+    from src.gpt import TranscriptAnalyzer
+    from src.results import dump_json, save_result, store_transcript
+    from src.youtube_transcript import extract_video_id, fetch_transcript
+
+    video_id = extract_video_id(args.url)
+    analyzer = TranscriptAnalyzer()
+
+    # Cached verdict first: a hit needs neither the transcript nor the API
+    if not (args.force_analysis or args.force_extract):
+        cached = analyzer.last_verdict_for_video(video_id)
+        if cached is not None:
+            _emit(dump_json(cached).decode("utf-8"), pretty=args.pretty)
+            sys.stderr.write("cached analysis (use --force-analysis to override)\n")
+            return 0
+
+    rec = analyzer.get_transcript_by_video_id(video_id)
+    if rec is None or args.force_extract:
+        segments, language = fetch_transcript(video_id)
+        rec, _ = store_transcript(analyzer, video_id, segments, language)
+
+    verdict = asyncio.run(
+        analyzer.analyze(rec, show_progress=args.pretty, reuse=not args.force_analysis)
+    )
+    out, blob = save_result(video_id, verdict)
+
+    _emit(blob.decode("utf-8"), pretty=args.pretty)
+    sys.stderr.write(f"result saved to {out}\n")
+    return 0
+
+
+def _add_pretty(parser: argparse.ArgumentParser, default: object) -> None:
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        default=default,
+        help="Colourised output via Rich",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="fast_cli", description=__doc__.splitlines()[0]
+    )
+    _add_pretty(parser, False)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    # --pretty also after the sub-command; SUPPRESS keeps a sub-command that
+    # didn't see it from resetting a flag given before.
+    p_extract = sub.add_parser("extract", help="Fetch & store the transcript only")
+    _add_pretty(p_extract, argparse.SUPPRESS)
+    p_extract.add_argument("url", help="YouTube URL or 11-char ID")
+    p_extract.add_argument(
+        "-o", "--overwrite", action="store_true", help="Force re-download if present"
+    )
+    p_extract.set_defaults(func=cmd_extract)
+
+    p_analyze = sub.add_parser("analyze", help="Transcript + OpenAI analysis")
+    _add_pretty(p_analyze, argparse.SUPPRESS)
+    p_analyze.add_argument("url", help="YouTube URL or 11-char ID")
+    p_analyze.add_argument(
+        "-E", "--force-extract", action="store_true", help="Re-download transcript"
+    )
+    p_analyze.add_argument(
+        "-A", "--force-analysis", action="store_true", help="Ignore cached verdict"
+    )
+    p_analyze.set_defaults(func=cmd_analyze)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,31 +7,32 @@ from __future__ import annotations
 from datetime import datetime
 
 import asyncio
-import json
 import logging
-import sqlite3
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import typer
 from rich import print as rprint
 from typer import Context
 
-from config import RESULTS_DIR, ensure_dirs_exist
+from config import ensure_dirs_exist, settings
 from src.gpt import TranscriptAnalyzer
+from src.io_uring_writer import UringResultWriter, uring_available, write_atomic
+from src.results import dump_json, result_path, save_result, store_transcript
+from src.youtube_metadata import get_video_metadata_many
 from src.youtube_transcript import (
     extract_video_id,
     fetch_transcript,
-    save_transcript,
+    fetch_transcripts_many,
 )
 
-# ── logging ————————————————————————————————————————————————————————————
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-)
+# ── logging (configured in main(), not at import) ———————————————————————
 logger = logging.getLogger(__name__)
 
+# Created by ensure_dirs_exist() at import time; resolved once here.
+_RESULTS_DIR: Path = settings.results_dir
+
 # ── Typer app ————————————————————————————————————————————————————————————
 app = typer.Typer(
     add_completion=False,
@@ -58,46 +59,79 @@ def _get_analyzer() -> TranscriptAnalyzer:
 # ── helpers ————————————————————————————————————————————————————————
 
 
-def _pretty_json(data: dict) -> str:
-    """Pretty-print dicts that may contain datetime objects."""
-    return json.dumps(
-        data,
-        indent=2,
-        ensure_ascii=False,
-        default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o),
-    )
+def _pretty_json(data: Any) -> str:
+    """Pretty-print dicts or Pydantic models that may contain datetime objects."""
+    return dump_json(data).decode("utf-8")
+
+
+# Result-file writes still in flight; awaited by `_drain_writes` before the
+# event loop exits (the set also keeps the tasks from being garbage-collected).
+_pending_writes: set[asyncio.Task] = set()
+
+
+async def _save_json_async(path: Path, blob: bytes) -> None:
+    await asyncio.to_thread(write_atomic, path, blob)
+
+
+def _schedule_json_write(blob: bytes, path: Path) -> None:
+    """Write the encoded *blob* to *path* on the thread pool while the loop moves on."""
+    task = asyncio.create_task(_save_json_async(path, blob))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def _drain_writes() -> None:
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes)
+
+
+def _read_video_ids(path: Path) -> list[str]:
+    """Read one YouTube URL or ID per line, skipping blanks and `#` comments.
+
+    Repeats are dropped (first occurrence wins): the Batch API rejects a
+    file with duplicate custom_ids, and batch-run would analyse them twice.
+    """
+    ids = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        ids.append(extract_video_id(line))
+    return list(dict.fromkeys(ids))
 
 
-def _save_json_to_file(data: dict, path: Path) -> None:
-    path.write_text(_pretty_json(data), encoding="utf-8")
+def _prefetch_metadata(need: list[str]) -> None:
+    """Warm the metadata cache for every video that will need a transcript fetch.
+
+    One yt-dlp run covers them all, so the per-video `write_transcript_file`
+    calls that follow are cache hits instead of one subprocess each.
+    """
+    if len(need) > 1:
+        get_video_metadata_many(need)
 
 
-def _acquire_transcript(video_id: str, *, overwrite: bool = False):
+def _acquire_transcript(video_id: str, *, overwrite: bool = False, prefetched=None):
     """
     Return a SQLite row for `transcripts` (fetch and/or insert as needed).
 
-    Handles first-run DBs that might still miss the table.
+    *prefetched* is an already downloaded ``(segments, language)`` pair (see
+    `fetch_transcripts_many`). The schema is created once when the analyzer
+    is built, so the lookup below never hits a missing table.
     """
     analyzer = _get_analyzer()
 
-    # Existing transcript in DB? (handle ancient DBs missing table)
-    try:
-        rec = analyzer.get_transcript_by_video_id(video_id)
-    except sqlite3.OperationalError as exc:
-        if "no such table" in str(exc).lower():
-            rec = None  # first run on old DB — we'll create it below
-        else:
-            raise
-
+    # Existing transcript in DB?
+    rec = analyzer.get_transcript_by_video_id(video_id)
     if rec and not overwrite:
         return rec  # ✅ cache hit
 
-    # Otherwise download (or overwrite) transcript
-    rprint("[cyan]\nFetching transcript – this may take a few seconds…")
-
     try:
-        # Fetch transcript data and language
-        transcript_data, transcript_lang = fetch_transcript(video_id)
+        if prefetched is not None:
+            transcript_data, transcript_lang = prefetched
+        else:
+            # Otherwise download (or overwrite) transcript
+            rprint("[cyan]\nFetching transcript – this may take a few seconds…")
+            transcript_data, transcript_lang = fetch_transcript(video_id)
 
         # Make sure transcript_data is a list we can work with
         if not isinstance(transcript_data, list):
@@ -115,90 +149,155 @@ def _acquire_transcript(video_id: str, *, overwrite: bool = False):
             rprint("[red]Empty transcript data received")
             raise ValueError("Empty transcript data")
 
-        # Save the transcript
-        file_path, saved_to_db = save_transcript(
-            transcript_data,
-            video_id,
-            transcript_language=transcript_lang,
-            overwrite=overwrite
-        )
+        # Write the text file, then store + read back the row in one statement
+        rec, file_path = store_transcript(analyzer, video_id, transcript_data, transcript_lang)
 
-        tag = "saved" if saved_to_db else "updated" if overwrite else "skipped"
+        tag = "updated" if overwrite else "saved"
         rprint(f"[green]Transcript {tag} → {file_path}")
-
-        # Get the updated record
-        return analyzer.get_transcript_by_video_id(video_id)
+        return rec
 
     except Exception as exc:
         rprint(f"[red]Error in _acquire_transcript: {exc}")
         raise
 
 
-def process_video(video_id: str, force_extract: bool = False, force_analysis: bool = False):
-    """Process a video through the entire pipeline: extraction + analysis."""
+def _acquire_transcripts(video_ids: list[str], *, force_extract: bool) -> list:
+    """Stored transcript rows for *video_ids*, downloading missing ones in parallel.
+
+    Videos whose transcript can't be obtained are reported and left out.
+    """
+    if force_extract:
+        need = list(video_ids)
+    else:
+        stored = _get_analyzer().check_many_stored(video_ids)  # one IN (...) query
+        need = [v for v in video_ids if not stored[v]]
+    _prefetch_metadata(need)
+    fetched = {}
+    if len(need) > 1:
+        rprint(f"[cyan]\nFetching {len(need)} transcripts…")
+        fetched = dict(fetch_transcripts_many(need))
+    records = []
+    for video_id in video_ids:
+        try:
+            prefetched = fetched.get(video_id)
+            if isinstance(prefetched, BaseException):
+                raise prefetched
+            rec = _acquire_transcript(video_id, overwrite=force_extract, prefetched=prefetched)
+        except Exception as exc:  # noqa: BLE001
+            rprint(f"[red]Skipping {video_id}: {exc}")
+            continue
+        if rec is not None:
+            records.append(rec)
+    return records
+
+
+async def analyze_one(
+        video_id: str,
+        *,
+        force_extract: bool = False,
+        force_analysis: bool = False,
+        echo: bool = True,
+):
+    """Async pipeline for one video: transcript (worker thread) → OpenAI analysis.
+
+    With ``echo=False`` the verdict is not pretty-printed, which keeps output
+    readable when many videos run concurrently.
+    """
+    analyzer = _get_analyzer()
+
+    # Cached verdict first: a hit needs neither the transcript text nor the API
+    if not force_analysis and not force_extract:
+        cached = analyzer.last_verdict_for_video(video_id)
+        if cached:
+            if echo:
+                rprint("[green]Using cached analysis (use --force-analysis to override):")
+                rprint(_pretty_json(cached))
+            return cached
+
     # 1️⃣ transcript
     try:
         # Use _acquire_transcript which properly handles the transcript fetching and saving
-        transcript_rec = _acquire_transcript(video_id, overwrite=force_extract)
+        transcript_rec = await asyncio.to_thread(
+            _acquire_transcript, video_id, overwrite=force_extract
+        )
 
         if transcript_rec is None:
             rprint("[red]Could not acquire transcript; aborting.")
             raise typer.Exit(1)
 
-        # Display language information if available
-        # sqlite3.Row objects support dictionary-style access but not .get() method
-        # So we need to check if the key exists first
-        if "transcript_language" in transcript_rec.keys():
-            transcript_lang = transcript_rec["transcript_language"]
-            if transcript_lang and transcript_lang.lower() != 'en':
-                rprint(f"[yellow]Note: Using transcript in language: {transcript_lang}")
-                rprint("[yellow]Analysis may be less accurate for non-English content.")
+        # Display language information if available (init_schema guarantees
+        # the column, so index the sqlite3.Row directly – no keys() list)
+        transcript_lang = transcript_rec["transcript_language"]
+        if transcript_lang and transcript_lang.lower() != 'en':
+            rprint(f"[yellow]Note: Using transcript in language: {transcript_lang}")
+            rprint("[yellow]Analysis may be less accurate for non-English content.")
 
     except Exception as exc:  # noqa: BLE001
         rprint(f"[red]Transcript step failed: {exc}")
         raise typer.Exit(1)
 
     # 2️⃣ analysis
-    analyzer = _get_analyzer()
-
-    # Check for cached analysis if not forcing
-    if not force_analysis:
-        # Only check cache if analyzer has the method
-        if hasattr(analyzer, 'last_verdict_for_video'):
-            cached = analyzer.last_verdict_for_video(video_id)
-            if cached:
-                rprint("[green]Using cached analysis (use --force-analysis to override):")
-                rprint(_pretty_json(cached.model_dump()))
-                return cached
-
-    rprint("[cyan]\nRunning OpenAI analysis ... this might take a while.")
+    if echo:
+        rprint("[cyan]\nRunning OpenAI analysis ... this might take a while.")
     try:
-        verdict = asyncio.run(analyzer.analyze(transcript_rec))
+        verdict = await analyzer.analyze(transcript_rec, show_progress=echo, reuse=not force_analysis)
     except Exception as exc:  # noqa: BLE001
-        rprint(f"[red]OpenAI call failed: {exc}")
+        rprint(f"[red]OpenAI call failed for {video_id}: {exc}")
         raise typer.Exit(1)
 
     # ── output ────────────────────────────────────────────────
-    rprint("\n[bold magenta]— Analysis Result —")
-    pretty = _pretty_json(verdict.model_dump())
-    rprint(pretty)
+    # Encode once; the same bytes feed both the terminal and the result file.
+    blob = dump_json(verdict)
+    out = result_path(video_id, verdict)
+    _schedule_json_write(blob, out)
 
-    results_dir = Path(RESULTS_DIR)
-    results_dir.mkdir(parents=True, exist_ok=True)
-    out = results_dir / f"analysis_{video_id}_{verdict.timestamp:%Y%m%d_%H%M%S}.json"
-    _save_json_to_file(verdict.model_dump(), out)
+    if echo:
+        rprint("\n[bold magenta]— Analysis Result —")
+        rprint(blob.decode("utf-8"))
 
-    rprint(f"[green]\nResult saved to: {out}")
+    if echo:
+        rprint(f"[green]\nResult saved to: {out}")
     return verdict
 
 
+def process_video(video_id: str, force_extract: bool = False, force_analysis: bool = False):
+    """Process a video through the entire pipeline: extraction + analysis."""
+
+    async def _run():
+        _get_analyzer().start_warmup()  # overlaps the transcript fetch
+        try:
+            return await analyze_one(
+                video_id, force_extract=force_extract, force_analysis=force_analysis
+            )
+        finally:
+            await _drain_writes()
+
+    return asyncio.run(_run())
+
+
+async def _analyze_records(records: list, *, concurrency: Optional[int], reuse: bool) -> list:
+    """Analyse stored transcript rows concurrently and write one result file per verdict."""
+    analyzer = _get_analyzer()
+    analyzer.start_warmup()  # overlaps the first DB reads
+    try:
+        results = await analyzer.analyze_many(
+            records, concurrency, show_progress=True, reuse=reuse
+        )
+        for rec, result in zip(records, results):
+            if not isinstance(result, BaseException):
+                out = result_path(rec['video_id'], result)
+                _schedule_json_write(dump_json(result), out)
+        return results
+    finally:
+        await _drain_writes()
+
+
 # ── default (no sub-command) ————————————————————————————————————————
 
 
 @app.callback(invoke_without_command=True)
 def _default(
         ctx: Context,
-        url: str = typer.Argument(None, help="YouTube URL or 11-char ID"),
         force_extract: bool = typer.Option(
             False, "--force-extract", "-E", help="Re-download transcript"
         ),
@@ -212,19 +311,13 @@ def _default(
 
     ensure_dirs_exist()
 
-    # If URL was provided as argument, use it directly
-    if url:
-        video_id = extract_video_id(url) if "http" in url else url
-        process_video(video_id, force_extract, force_analysis)
-        raise typer.Exit()
-
     # Interactive prompt — user preference
     url = input("Enter the YouTube video URL (or ID): ").strip()
     if not url:
         rprint("[red]No URL provided. Exiting.")
         raise typer.Exit(1)
 
-    video_id = extract_video_id(url) if "http" in url else url
+    video_id = extract_video_id(url)
     process_video(video_id, force_extract, force_analysis)
     raise typer.Exit()
 
@@ -241,7 +334,7 @@ def extract(
 ):
     """Only fetch & store the transcript (skip analysis)."""
     ensure_dirs_exist()
-    video_id = extract_video_id(url) if "http" in url else url
+    video_id = extract_video_id(url)
     _acquire_transcript(video_id, overwrite=overwrite)
     rprint("[bold green]\nDone!")
 
@@ -258,10 +351,182 @@ def analyze(
 ):
     """End-to-end pipeline (transcript + analysis) with cache controls."""
     ensure_dirs_exist()
-    video_id = extract_video_id(url) if "http" in url else url
+    video_id = extract_video_id(url)
     process_video(video_id, force_extract, force_analysis)
 
 
+@app.command()
+def batch(
+        source: Path = typer.Argument(
+            ..., exists=True, dir_okay=False, help="Text file with one YouTube URL or ID per line"
+        ),
+        force_extract: bool = typer.Option(
+            False, "--force-extract", "-E", help="Re-download transcripts"
+        ),
+        force_analysis: bool = typer.Option(
+            False, "--force-analysis", "-A", help="Re-analyse videos that already have a verdict"
+        ),
+        uring: bool = typer.Option(
+            False, "--uring", help="Write result files in one io_uring submission (Linux + liburing)"
+        ),
+):
+    """Analyse many videos through the OpenAI Batch API (half price, ≤24h)."""
+    ensure_dirs_exist()
+    analyzer = _get_analyzer()
+
+    video_ids = _read_video_ids(source)
+    if not force_analysis:
+        analysed = analyzer.check_many_analyzed(video_ids)
+        done = [v for v in video_ids if analysed[v]]
+        if done:
+            rprint(f"[yellow]Skipping {len(done)} already-analysed video(s) (use --force-analysis to redo).")
+        video_ids = [v for v in video_ids if not analysed[v]]
+        if not video_ids:
+            rprint("[green]Every video already has a verdict; nothing to submit.")
+            raise typer.Exit()
+
+    records = _acquire_transcripts(video_ids, force_extract=force_extract)
+    if not records:
+        rprint("[red]No transcripts available; nothing to submit.")
+        raise typer.Exit(1)
+
+    jsonl_path = _RESULTS_DIR / f"batch_{datetime.utcnow():%Y%m%d_%H%M%S}.jsonl"
+    batch_id = analyzer.submit_batch(records, jsonl_path)
+    rprint(
+        f"[cyan]\nSubmitted batch {batch_id} ({len(records)} videos) – waiting for results…"
+        f" (if interrupted, collect them later with `batch-resume {batch_id}`)"
+    )
+
+    stored = _collect_batch(analyzer, batch_id, uring=uring)
+    rprint(f"[bold green]\nBatch done: {stored}/{len(records)} verdicts stored.")
+
+
+def _collect_batch(analyzer: TranscriptAnalyzer, batch_id: str, *, uring: bool) -> int:
+    """Wait for *batch_id*, store its verdicts and write one result file each."""
+    try:
+        results = analyzer.poll_and_ingest(batch_id)
+    except RuntimeError as exc:
+        rprint(f"[red]{exc}")
+        raise typer.Exit(1)
+
+    if uring and not uring_available():
+        rprint("[yellow]liburing not available – falling back to regular file writes.")
+    writer = UringResultWriter() if uring else None
+    for video_id, verdict in results:
+        if writer is not None:
+            out = result_path(video_id, verdict)
+            writer.submit_write(out, dump_json(verdict))
+        else:
+            out, _ = save_result(video_id, verdict)
+        rprint(f"[green]{video_id}: {verdict.answer} → {out}")
+    if writer is not None:
+        writer.flush()
+    return len(results)
+
+
+@app.command(name="batch-resume")
+def batch_resume(
+        batch_id: Optional[str] = typer.Argument(
+            None, help="Batch ID to collect (default: every batch still awaiting results)"
+        ),
+        uring: bool = typer.Option(
+            False, "--uring", help="Write result files in one io_uring submission (Linux + liburing)"
+        ),
+):
+    """Collect the results of a batch submitted earlier (e.g. after `batch` was interrupted)."""
+    ensure_dirs_exist()
+    analyzer = _get_analyzer()
+    batch_ids = [batch_id] if batch_id else analyzer.unfinished_batches()
+    if not batch_ids:
+        rprint("[green]No batches awaiting results.")
+        raise typer.Exit()
+
+    for bid in batch_ids:
+        rprint(f"[cyan]\nWaiting for batch {bid}…")
+        stored = _collect_batch(analyzer, bid, uring=uring)
+        rprint(f"[bold green]Batch {bid}: {stored} verdicts stored.")
+
+
+@app.command(name="batch-run")
+def batch_run(
+        source: Path = typer.Argument(
+            ..., exists=True, dir_okay=False, help="Text file with one YouTube URL or ID per line"
+        ),
+        concurrency: Optional[int] = typer.Option(
+            None,
+            "--concurrency",
+            "-c",
+            min=1,
+            help="Analyses run in parallel (default: OPENAI_CONCURRENCY)",
+        ),
+        force_extract: bool = typer.Option(
+            False, "--force-extract", "-E", help="Re-download transcripts"
+        ),
+        force_analysis: bool = typer.Option(
+            False, "--force-analysis", "-A", help="Ignore cached verdicts"
+        ),
+):
+    """Run the full pipeline for many videos concurrently (real-time API, shared async client)."""
+    ensure_dirs_exist()
+    analyzer = _get_analyzer()
+    video_ids = _read_video_ids(source)
+    total = len(video_ids)
+
+    cached = 0
+    if not force_analysis and not force_extract:
+        analysed = analyzer.check_many_analyzed(video_ids)
+        cached = sum(analysed.values())
+        if cached:
+            rprint(f"[yellow]Skipping {cached} already-analysed video(s) (use --force-analysis to redo).")
+        video_ids = [v for v in video_ids if not analysed[v]]
+
+    records = _acquire_transcripts(video_ids, force_extract=force_extract)
+    results = asyncio.run(
+        _analyze_records(records, concurrency=concurrency, reuse=not force_analysis)
+    )
+
+    done = cached
+    for rec, result in zip(records, results):
+        if isinstance(result, BaseException):
+            rprint(f"[red]{rec['video_id']}: failed ({result})")
+        else:
+            done += 1
+            rprint(f"[green]{rec['video_id']}: {result.answer}")
+    rprint(f"[bold green]\n{done}/{total} videos analysed.")
+    if done < total:
+        raise typer.Exit(1)
+
+
+@app.command()
+def pending(
+        concurrency: Optional[int] = typer.Option(
+            None,
+            "--concurrency",
+            "-c",
+            min=1,
+            help="Analyses run in parallel (default: OPENAI_CONCURRENCY)",
+        ),
+):
+    """Analyse every stored transcript that has no verdict yet."""
+    ensure_dirs_exist()
+    analyzer = _get_analyzer()
+
+    def report(rec, verdict) -> None:
+        out = result_path(rec['video_id'], verdict)
+        _schedule_json_write(dump_json(verdict), out)
+        rprint(f"[green]{rec['video_id']}: {verdict.answer}")
+
+    async def _run() -> int:
+        analyzer.start_warmup()
+        try:
+            return await analyzer.analyze_pending(concurrency, on_verdict=report)
+        finally:
+            await _drain_writes()
+
+    stored = asyncio.run(_run())
+    rprint(f"[bold green]\n{stored} pending transcript(s) analysed.")
+
+
 @app.command(name="list")
 def _list(
         limit: int = typer.Option(10, "--limit", "-n", help="Rows to show"),
@@ -278,5 +543,27 @@ def _list(
 
 
 # ── entry-point ——————————————————————————————————————————————————————
+
+
+def main() -> None:
+    """Run the CLI; a bare URL/ID (no sub-command) is routed to `analyze`.
+
+    A positional argument on the callback itself would swallow sub-command
+    names, so the shorthand is resolved here instead.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    commands = {
+        c.name or c.callback.__name__.replace("_", "-") for c in app.registered_commands
+    }
+    args = sys.argv[1:]
+    first = next((a for a in args if not a.startswith("-")), None)
+    if first is not None and first not in commands:
+        args = ["analyze", *args]
+    app(args)
+
+
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    main()
\ No newline at end of file
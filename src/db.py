@@ -1,213 +1,279 @@
-# db.py – connect_db function and database operations
+# db.py – connect_db function (legacy transcript helpers re-exported)
 # -------------------------------------------------------------------------
+# This module used to carry its own copy of the transcript fetch/persist
+# code.  That copy lives in `youtube_transcript` now; the names below are
+# kept so older `from src.db import …` callers keep working without
+# loading (or maintaining) a second implementation.
 from __future__ import annotations
 
-import json
-import logging
-import re
+import atexit
+import hashlib
 import sqlite3
+import threading
+import zlib
 from contextlib import contextmanager
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Dict, List, Optional, Tuple
 
-from youtube_transcript_api import YouTubeTranscriptApi, YouTubeTranscriptApiError  # type: ignore
+try:
+    import zstandard  # optional: faster/better transcript compression
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
 
 # Local imports
-from config import settings, ensure_dirs_exist
+from config import settings
 
-from src.youtube_metadata import get_video_metadata, get_video_metadata_pytube
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings  # <-- new home of BaseSettings
-
-logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+# Legacy names served from `youtube_transcript` on first access (PEP 562),
+# so importing this module for the schema/packing helpers doesn't load the
+# transcript stack (requests, youtube_transcript_api, metadata look-ups).
+_REEXPORTS = frozenset(
+    {"_interactive_flow", "_transcript_exists", "extract_video_id", "format_transcript", "save_transcript"}
 )
 
+
+def __getattr__(name: str) -> Any:
+    if name in _REEXPORTS:
+        from src import youtube_transcript
+
+        return getattr(youtube_transcript, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # ---------------------------------------------------------------------------
 # Database connection
 # ---------------------------------------------------------------------------
 
-@contextmanager
-def connect_db():
-    """Context-managed SQLite connection with row factory."""
+
+_shared_conn: Optional[sqlite3.Connection] = None
+_shared_lock = threading.RLock()
+
+
+def _open_db() -> sqlite3.Connection:
     conn = sqlite3.connect(settings.db_path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    if str(settings.db_path) != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL;")  # persists in the file header
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=2147483648;")  # clamped to SQLite's max
+    conn.execute("PRAGMA cache_size=-65536;")
+    return conn
+
+
+def _close(conn: sqlite3.Connection) -> None:
+    """Refresh planner statistics (cheap no-op if nothing changed), then close."""
     try:
-        yield conn
-    finally:
-        conn.close()
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+
+@contextmanager
+def connect_db():
+    """Yield the process-wide SQLite connection with row factory.
+
+    Opened on first use and closed at interpreter exit; threads take turns
+    holding it for the duration of the ``with`` block.
+    """
+    global _shared_conn  # noqa: PLW0603
+    with _shared_lock:
+        if _shared_conn is None:
+            _shared_conn = _open_db()
+            atexit.register(_close, _shared_conn)
+        yield _shared_conn
+
 
 # ---------------------------------------------------------------------------
-# URL helpers
+# Schema (run once per database per process)
 # ---------------------------------------------------------------------------
 
-def extract_video_id(youtube_url: str) -> str:
-    parsed = urlparse(youtube_url)
-    host = parsed.hostname or ""
-    if host in {"www.youtube.com", "youtube.com"}:
-        if parsed.path == "/watch":
-            return parse_qs(parsed.query).get("v", [""])[0]
-        if parsed.path.startswith("/embed/"):
-            return parsed.path.split("/")[2]
-        if parsed.path.startswith("/v/"):
-            return parsed.path.split("/")[2]
-    elif host == "youtu.be":
-        return parsed.path.lstrip("/")
-    raise ValueError("Could not extract video ID from URL – unsupported format.")
+_SCHEMA_READY: set[str] = set()
+_schema_lock = threading.Lock()
+
+# Stored in PRAGMA user_version once _create_schema has run; bump it whenever
+# _create_schema gains a new table, column, index or data migration.
+_SCHEMA_VERSION = 1
+
+# analysis_results columns added after the first release
+_ANALYSIS_COLUMNS = {
+    "answer": "TEXT",
+    "reasoning": "TEXT",
+    "evidence": "TEXT",
+    "model": "TEXT",
+    "tokens_used": "INTEGER",
+    "analysis_date": "TIMESTAMP",
+}
+
+
+def init_schema(conn: sqlite3.Connection) -> None:
+    """Create/migrate every table and index in one transaction.
+
+    Idempotent and cheap after the first call: databases already set up in
+    this process are skipped without touching SQLite, and databases at the
+    current `_SCHEMA_VERSION` cost a single header read.
+    """
+    db_file = conn.execute("PRAGMA database_list;").fetchone()[2]
+    with _schema_lock:
+        if db_file and db_file in _SCHEMA_READY:
+            return
+        if conn.execute("PRAGMA user_version;").fetchone()[0] < _SCHEMA_VERSION:
+            try:
+                _create_schema(conn)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION};")
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        if db_file:  # in-memory databases are distinct per connection
+            _SCHEMA_READY.add(db_file)
+
+
+# Base tables – one executescript call (a single parse) opens the
+# transaction and creates them all.
+_TABLES_DDL = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL,
+    video_title TEXT,
+    channel_name TEXT,
+    transcript_text TEXT NOT NULL,
+    transcript_language TEXT,
+    extraction_date TIMESTAMP NOT NULL,
+    transcript_sha256 TEXT,
+    transcript_compressed BLOB
+);
+CREATE TABLE IF NOT EXISTS analysis_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transcript_id INTEGER NOT NULL,
+    answer TEXT,
+    reasoning TEXT,
+    evidence TEXT,
+    model TEXT,
+    tokens_used INTEGER,
+    analysis_date TIMESTAMP,
+    FOREIGN KEY (transcript_id) REFERENCES transcripts(id)
+);
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    batch_id TEXT PRIMARY KEY,
+    input_file_id TEXT,
+    request_count INTEGER,
+    status TEXT NOT NULL,
+    output_file_id TEXT,
+    created_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP
+);
+"""
+
+
+def _sha256_hex(text: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest() if text is not None else None
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(_TABLES_DDL)  # commits anything pending, then BEGINs
+
+    # Lightweight column migrations for databases from older versions
+    have = {row[1] for row in conn.execute("PRAGMA table_info(transcripts);")}
+    if "transcript_language" not in have:
+        conn.execute("ALTER TABLE transcripts ADD COLUMN transcript_language TEXT;")
+    if "transcript_compressed" not in have:
+        conn.execute("ALTER TABLE transcripts ADD COLUMN transcript_compressed BLOB;")
+    if "transcript_sha256" not in have:
+        conn.execute("ALTER TABLE transcripts ADD COLUMN transcript_sha256 TEXT;")
+        # One-off backfill so existing transcripts take part in dedup
+        conn.create_function("_sha256", 1, _sha256_hex, deterministic=True)
+        conn.execute("UPDATE transcripts SET transcript_sha256 = _sha256(transcript_text);")
+    have = {row[1] for row in conn.execute("PRAGMA table_info(analysis_results);")}
+    for col, sqltype in _ANALYSIS_COLUMNS.items():
+        if col not in have:
+            conn.execute(f"ALTER TABLE analysis_results ADD COLUMN {col} {sqltype};")
+
+    # One row per video (needed for ON CONFLICT upserts). Older DBs may hold
+    # duplicates: point results at the newest row, drop the rest.
+    conn.execute("""
+        UPDATE analysis_results
+        SET transcript_id = (
+            SELECT MAX(t2.id) FROM transcripts t1
+            JOIN transcripts t2 ON t2.video_id = t1.video_id
+            WHERE t1.id = analysis_results.transcript_id
+        )
+        WHERE transcript_id IN (SELECT id FROM transcripts);
+    """)
+    conn.execute("""
+        DELETE FROM transcripts
+        WHERE id NOT IN (SELECT MAX(id) FROM transcripts GROUP BY video_id);
+    """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_transcripts_video_id ON transcripts(video_id);")
+    # Recent-first listing and "latest verdict for transcript" lookups
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_date ON transcripts(extraction_date DESC);")
+    # Identical transcripts (e.g. re-extracted captions) reuse an earlier verdict
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transcripts_sha256 ON transcripts(transcript_sha256);")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ar_tid_date ON analysis_results(transcript_id, analysis_date DESC);"
+    )
+
+
+# Legacy name kept for older imports
+_ensure_transcripts_table = init_schema
 
 
 # ---------------------------------------------------------------------------
-# Transcript fetching
+# Transcript text storage (optionally compressed)
 # ---------------------------------------------------------------------------
 
-def fetch_transcript(video_id: str, languages: Optional[List[str]] = None) -> List[Dict]:
-    languages = languages or ["en"]
-    try:
-        return YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-    except YouTubeTranscriptApiError as exc:
-        logger.error("Transcript API error for %s: %s", video_id, exc)
-        raise
-    except Exception as exc:  # noqa: BLE001
-        logger.error("Unexpected error fetching transcript for %s: %s", video_id, exc)
-        raise
-
+# Frames are self-describing: zstd frames start with this magic, zlib with 0x78.
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
-def _format_time(seconds: float) -> str:
-    m, s = divmod(int(seconds), 60)
-    return f"{m:02d}:{s:02d}"
 
+def pack_transcript_text(text: str) -> Tuple[str, Optional[bytes]]:
+    """Return the (transcript_text, transcript_compressed) column values for *text*.
 
-def format_transcript(transcript: List[Dict]) -> str:
-    if not transcript:
-        return "<no transcript available>"
-    return "\n".join(f"[{_format_time(e['start'])}] {e['text']}" for e in transcript)
+    With COMPRESS_TRANSCRIPTS enabled the text is stored compressed and the
+    plain column is left empty; transcripts typically shrink 3-6x.
+    """
+    if not settings.compress_transcripts:
+        return text, None
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return "", zstandard.ZstdCompressor(level=3).compress(raw)
+    return "", zlib.compress(raw, 6)
 
 
-# ---------------------------------------------------------------------------
-# Persistence helpers
-# ---------------------------------------------------------------------------
+def unpack_transcript_text(text: Optional[str], blob: Optional[bytes]) -> str:
+    """Inverse of `pack_transcript_text` (plain rows pass straight through)."""
+    if blob is None:
+        return text or ""
+    if blob[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Transcript is zstd-compressed; install the 'zstandard' package.")
+        return zstandard.ZstdDecompressor().decompress(blob).decode("utf-8")
+    return zlib.decompress(blob).decode("utf-8")
 
-def _ensure_transcripts_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS transcripts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            video_id TEXT NOT NULL,
-            video_title TEXT,
-            channel_name TEXT,
-            transcript_text TEXT NOT NULL,
-            transcript_language TEXT,
-            extraction_date TIMESTAMP NOT NULL
-        );
-        """
-    )
-    conn.commit()
 
-    # Check if transcript_language column exists, add it if not
-    try:
-        conn.execute("SELECT transcript_language FROM transcripts LIMIT 1")
-    except sqlite3.OperationalError:
-        conn.execute("ALTER TABLE transcripts ADD COLUMN transcript_language TEXT;")
-        conn.commit()
-
-
-def _transcript_exists(conn: sqlite3.Connection, video_id: str) -> bool:
-    return conn.execute("SELECT 1 FROM transcripts WHERE video_id = ? LIMIT 1", (video_id,)).fetchone() is not None
-
-
-def save_transcript(
-    transcript: List[Dict],
-    video_id: str,
-    video_title: Optional[str] = None,
-    channel_name: Optional[str] = None,
-    transcript_language: Optional[str] = None,
-    overwrite: bool = False,
-) -> Tuple[Path, bool]:
-    ensure_dirs_exist()
-
-    if not (video_title and channel_name):
-        auto_title, auto_channel = get_video_metadata(video_id)
-        if not auto_title or not auto_channel:
-            auto_title, auto_channel = get_video_metadata_pytube(video_id)
-        video_title = video_title or auto_title or f"Unknown Title – {video_id}"
-        channel_name = channel_name or auto_channel or "Unknown Channel"
-
-    safe_id = video_id.replace("/", "_").replace("\\", "_")
-    safe_title = re.sub(r"[^\w\s-]", "", video_title).replace(" ", "_")[:60]
-    file_path = settings.transcripts_dir / f"transcript_{safe_id}_{safe_title}.txt"
-    file_path.write_text(format_transcript(transcript), encoding="utf-8")
-    logger.info("Transcript written to %s", file_path)
-
-    saved = False
-    with connect_db() as conn:
-        _ensure_transcripts_table(conn)
-        if _transcript_exists(conn, video_id):
-            if overwrite:
-                conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
-            else:
-                logger.info("Transcript for %s already in DB; skipping insert.", video_id)
-                return file_path, False
-        conn.execute(
-            """
-            INSERT INTO transcripts (video_id, video_title, channel_name, 
-                                     transcript_text, transcript_language, extraction_date) 
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                video_id,
-                video_title,
-                channel_name,
-                "\n".join(e["text"] for e in transcript),
-                transcript_language,
-                datetime.utcnow().isoformat(),
-            ),
-        )
-        conn.commit()
-        saved = True
-        logger.info("Transcript stored in DB (video_id=%s, language=%s)", video_id, transcript_language or "unknown")
-    return file_path, saved
+def row_transcript_text(row: Any) -> str:
+    """Full transcript text of a `SELECT *` transcripts row."""
+    return unpack_transcript_text(row["transcript_text"], row["transcript_compressed"])
 
 
 # ---------------------------------------------------------------------------
-# Interactive flow
+# Transcript fetching (legacy signature: segments only, no language)
 # ---------------------------------------------------------------------------
 
-def _interactive_flow() -> None:
-    ensure_dirs_exist()
-    url = input("Enter the YouTube video URL: ").strip()
-    try:
-        vid = extract_video_id(url)
-    except ValueError as exc:
-        logger.error("%s", exc)
-        print(f"Error: {exc}")
-        return
 
-    try:
-        print("Fetching transcript… (this might take a few seconds)")
-        transcript_data = fetch_transcript(vid)
-    except Exception as exc:  # noqa: BLE001
-        print(f"Failed to fetch transcript: {exc}")
-        return
-
-    preview = "\n".join(entry["text"] for entry in transcript_data)[:500]
-    print("\nTranscript preview:\n", preview, "…\n", sep="")
-
-    title_override = input("Video title (press Enter to auto / keep): ").strip()
-    channel_override = input("Channel name (press Enter to auto / keep): ").strip()
-
-    fp, saved_flag = save_transcript(
-        transcript_data,
-        video_id=vid,
-        video_title=title_override or None,
-        channel_name=channel_override or None,
-    )
-    print(f"Transcript saved to file: {fp}")
-    print("Transcript also saved to database." if saved_flag else "Transcript already existed in database.")
+def fetch_transcript(video_id: str, languages: Optional[List[str]] = None) -> List[Dict]:
+    from src.youtube_transcript import fetch_transcript as _fetch_transcript
+
+    segments, _language = _fetch_transcript(video_id, languages)
+    return segments
 
 
 if __name__ == "__main__":
-    _interactive_flow()
\ No newline at end of file
+    import logging
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    from src.youtube_transcript import _interactive_flow
+
+    _interactive_flow()
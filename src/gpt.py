@@ -2,35 +2,101 @@
 # ------------------------------------------------
 # • Cleaned imports
 # • Bootstraps reproducible SQLite schema
+# • One writer + pooled read-only SQLite connections (WAL, mmap)
 # • Pydantic model with relaxed evidence list
 # • Minimal Typer CLI (list transcripts)
+# • OpenAI Batch API submission + result ingestion
 # ------------------------------------------------
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import io
 import json
 import logging
+import os
+import queue
+import random
 import sqlite3
-from contextlib import contextmanager
+import threading
+import time
+from contextlib import contextmanager, suppress
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
 
-import typer
-from openai import OpenAI
 from pydantic import BaseModel, Field, ValidationError
-from rich import print as rprint
-from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
+try:
+    import orjson  # optional: faster (de)serialisation
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgspec  # optional: decode verdicts straight into a typed struct
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore
+
+try:
+    import tiktoken  # optional: token-exact transcript truncation
+except ImportError:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+if TYPE_CHECKING:  # openai, typer and rich are imported on first use
+    import typer
+    from openai import AsyncOpenAI, OpenAI
+    from rich.progress import Progress
 
 from config import ensure_dirs_exist, settings
+from .db import init_schema, pack_transcript_text, row_transcript_text
+from .rate_limit import RateLimiter
 from .system_prompt import construct_genocide_analysis_prompt
 
-# Logging setup
+# Logging is configured by the entry points (see the __main__ block below)
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+
+
+# Batch API job states after which polling can stop
+_BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+# The system prompt is constant (it embeds ANALYSIS_SCHEMA); build it once.
+# It is always sent verbatim as the first message, with nothing interpolated
+# into it, so every request shares one prefix for OpenAI's automatic prompt
+# cache. The cache key routes those requests to the same cache shard and
+# changes whenever the prompt text does.
+_SYSTEM_PROMPT = construct_genocide_analysis_prompt()
+_PROMPT_CACHE_KEY = "genocide-" + hashlib.sha256(_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+# Transcript budget per request. Counted in tokens when tiktoken is
+# installed, otherwise approximated by characters (~4 chars per token).
+_MAX_TRANSCRIPT_TOKENS = 22_500
+_MAX_TRANSCRIPT_CHARS = 90_000
+
+# 429 handling on top of the proactive limiter: capped exponential back-off + jitter
+_RATE_LIMIT_RETRIES = 5
+_RATE_LIMIT_MAX_DELAY = 60.0
+# Timed-out requests get fewer retries (the SDK has already retried twice)
+_TIMEOUT_RETRIES = 2
+
+# Per-connection tuning: 64 MiB page cache, in-memory temp tables, and up to
+# 2 GiB of the file memory-mapped so page reads are pointer loads rather than
+# read() syscalls (SQLite clamps this to its compile-time maximum).
+_CONN_PRAGMAS = (
+    "PRAGMA cache_size=-65536;",
+    "PRAGMA mmap_size=2147483648;",
+    "PRAGMA temp_store=MEMORY;",
 )
 
 
@@ -48,164 +114,783 @@ class GenocideVerdict(BaseModel):
     timestamp: Optional[datetime] = None
 
 
-@contextmanager
-def _connect(db_path: Path):
-    """Context-managed SQLite connection with row factory."""
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+if msgspec is not None:
+
+    class _VerdictMsg(msgspec.Struct):
+        """Wire shape of the model's answer; mirrors GenocideVerdict's response fields."""
+
+        answer: Literal["Yes", "No", "Cannot determine"]
+        reasoning: str
+        evidence: List[str] = []
+
+    _verdict_decoder = msgspec.json.Decoder(_VerdictMsg)
+
+
+def _json_loads(raw: str | bytes) -> Any:
+    """Parse JSON with orjson when installed (its errors subclass JSONDecodeError)."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _json_dumps(data: Any) -> str:
+    """Compact UTF-8 JSON text (non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False)
+
+
+@lru_cache(maxsize=None)
+def _encoding_for(model: str) -> Any:
+    """tiktoken encoding for *model* (cl100k_base if unknown); None without tiktoken."""
+    if tiktoken is None:
+        return None
     try:
-        yield conn
-    finally:
-        conn.close()
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _truncate_transcript(text: str, model: str) -> str:
+    """Cut *text* to the per-request transcript budget, marking any truncation."""
+    enc = _encoding_for(model)
+    if enc is None:
+        if len(text) > _MAX_TRANSCRIPT_CHARS:
+            return text[:_MAX_TRANSCRIPT_CHARS] + "… [truncated]"
+        return text
+    # Cheap exit: a BPE token spans at least one UTF-8 byte, so a text that
+    # fits in bytes fits in tokens (characters alone don't: CJK, emoji, …).
+    if len(text.encode("utf-8")) <= _MAX_TRANSCRIPT_TOKENS:
+        return text
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= _MAX_TRANSCRIPT_TOKENS:
+        return text
+    return enc.decode(tokens[:_MAX_TRANSCRIPT_TOKENS]) + "… [truncated]"
+
+
+def _open_connection(db_path: Path, *, read_only: bool = False) -> sqlite3.Connection:
+    """Open a long-lived SQLite connection with row factory and tuning pragmas."""
+    if read_only:
+        conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only=1;")
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        if str(db_path) != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.row_factory = sqlite3.Row
+    for pragma in _CONN_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
 
 class TranscriptAnalyzer:
     """High-level API: *transcript row* → structured GenocideVerdict."""
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    # Fixed SQL text, so each pooled connection's statement cache reuses the
+    # prepared statement instead of re-parsing it. Every statement the
+    # analyzer runs repeatedly lives here.
+    # Row lookups skip the (possibly compressed, ~90 KB) transcript text;
+    # `_transcript_text` loads it only when a prompt is actually built.
+    _ROW_COLUMNS = (
+        "id, video_id, video_title, channel_name, transcript_language, extraction_date, "
+        "transcript_sha256"
+    )
+    _SQL_BY_ID = f"SELECT {_ROW_COLUMNS} FROM transcripts WHERE id = ?"
+    _SQL_BY_VID = f"SELECT {_ROW_COLUMNS} FROM transcripts WHERE video_id = ?"
+    _SQL_RECENT = (
+        "SELECT id, video_id, video_title, channel_name, extraction_date "
+        "FROM transcripts ORDER BY extraction_date DESC LIMIT ?"
+    )
+    _SQL_EXISTS = "SELECT 1 FROM transcripts WHERE video_id = ?"
+    _SQL_TEXT = "SELECT transcript_text, transcript_compressed FROM transcripts WHERE id = ?"
+    # Newest verdict for a video: one unique-index probe on transcripts, then
+    # one idx_ar_tid_date probe – transcript_text is never read.
+    _SQL_LAST_VERDICT = (
+        "SELECT ar.answer, ar.reasoning, ar.evidence, ar.model, ar.tokens_used, ar.analysis_date, "
+        "t.video_title FROM transcripts t "
+        "JOIN analysis_results ar ON ar.transcript_id = t.id "
+        "WHERE t.video_id = ? ORDER BY ar.analysis_date DESC LIMIT 1"
+    )
+    _SQL_PENDING = (
+        f"SELECT {_ROW_COLUMNS} FROM transcripts t WHERE NOT EXISTS "
+        "(SELECT 1 FROM analysis_results ar WHERE ar.transcript_id = t.id) ORDER BY t.id"
+    )
+    # Newest verdict for any *other* transcript with identical text
+    _SQL_VERDICT_BY_HASH = (
+        "SELECT ar.transcript_id, ar.answer, ar.reasoning, ar.evidence, ar.model "
+        "FROM transcripts t JOIN analysis_results ar ON ar.transcript_id = t.id "
+        "WHERE t.transcript_sha256 = ? AND t.id != ? ORDER BY ar.analysis_date DESC LIMIT 1"
+    )
+    _SQL_UPSERT = """
+        INSERT INTO transcripts (
+            video_id, video_title, channel_name, transcript_text, transcript_language, extraction_date,
+            transcript_sha256, transcript_compressed
+        ) VALUES (?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now'), ?, ?)
+        ON CONFLICT(video_id) DO UPDATE SET
+            video_title = excluded.video_title,
+            channel_name = excluded.channel_name,
+            transcript_text = excluded.transcript_text,
+            transcript_language = excluded.transcript_language,
+            extraction_date = excluded.extraction_date,
+            transcript_sha256 = excluded.transcript_sha256,
+            transcript_compressed = excluded.transcript_compressed
+        RETURNING *
+    """
+    _SQL_SAVE_RESULT = (
+        "INSERT INTO analysis_results "
+        "(transcript_id, answer, reasoning, evidence, model, tokens_used, analysis_date) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+    _SQL_BATCH_SUBMITTED = (
+        "INSERT OR REPLACE INTO batch_jobs "
+        "(batch_id, input_file_id, request_count, status, created_at) VALUES (?, ?, ?, ?, ?)"
+    )
+    _SQL_BATCH_FINISHED = (
+        "UPDATE batch_jobs SET status = ?, output_file_id = ?, finished_at = ? WHERE batch_id = ?"
+    )
+    _SQL_BATCH_UNFINISHED = (
+        "SELECT batch_id FROM batch_jobs WHERE finished_at IS NULL ORDER BY created_at DESC"
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        *,
+        read_pool_size: Optional[int] = None,
+    ):
         self.api_key = api_key or settings.openai_api_key
         self.model = model or settings.openai_model
-        self.client = OpenAI(api_key=self.api_key)
+        self.system_prompt = _SYSTEM_PROMPT  # static cacheable prefix, see above
+        self._warmup: Optional[asyncio.Task] = None
+        # Caps concurrent API calls however many analyses are awaited at once
+        self._api_sem = asyncio.Semaphore(max(settings.openai_concurrency, 1))
+        self._limiter: Optional[RateLimiter] = None
+        if settings.openai_rpm or settings.openai_tpm:
+            self._limiter = RateLimiter(settings.openai_rpm, settings.openai_tpm)
 
         ensure_dirs_exist()
         self.db_path = settings.db_path
+
+        # Single writer (serialised by a lock) + a pool of read-only connections.
+        # WAL lets the readers proceed while a write is in flight.  Readers are
+        # opened on demand, up to min(32, 2 × CPUs) unless sized explicitly.
+        self._writer = _open_connection(self.db_path)
+        self._write_lock = threading.Lock()
         self._ensure_tables()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._reader_limit = max(read_pool_size or min(32, (os.cpu_count() or 1) * 2), 1)
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        # Group commit: verdicts finished while a commit is in flight share the next one
+        self._save_queue: List[Tuple[int, GenocideVerdict]] = []
+        self._save_task: Optional[asyncio.Future] = None
+
+    # The openai package costs ~0.6 s to import; commands that only touch the
+    # DB (list, cached verdicts) never pay it.
+    @cached_property
+    def client(self) -> "OpenAI":
+        """Sync client for the Batch API / file helpers."""
+        from openai import OpenAI
+
+        return OpenAI(api_key=self.api_key)
+
+    @cached_property
+    def async_client(self) -> "AsyncOpenAI":
+        """Shared async client: one connection pool (TCP + TLS) for every analysis."""
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=self.api_key)
+
+    @contextmanager
+    def _write_conn(self):
+        with self._write_lock:
+            yield self._writer
+
+    @contextmanager
+    def _read_conn(self):
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._new_reader() or self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _new_reader(self) -> Optional[sqlite3.Connection]:
+        """Open another pooled reader, or None once the pool is at its limit."""
+        with self._reader_lock:
+            if self._reader_count >= self._reader_limit:
+                return None
+            self._reader_count += 1
+        try:
+            return _open_connection(self.db_path, read_only=True)
+        except BaseException:
+            with self._reader_lock:
+                self._reader_count -= 1
+            raise
+
+    def close(self) -> None:
+        """Close the writer and every pooled reader connection."""
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        self._writer.close()
 
     def _ensure_tables(self) -> None:
         """Create SQLite tables (transcripts + analysis_results) and migrate schema."""
-        with _connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS transcripts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    video_id TEXT NOT NULL,
-                    video_title TEXT,
-                    channel_name TEXT,
-                    transcript_text TEXT NOT NULL,
-                    extraction_date TIMESTAMP NOT NULL
-                );
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS analysis_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    transcript_id INTEGER NOT NULL,
-                    answer TEXT,
-                    reasoning TEXT,
-                    evidence TEXT,
-                    model TEXT,
-                    tokens_used INTEGER,
-                    analysis_date TIMESTAMP,
-                    FOREIGN KEY (transcript_id) REFERENCES transcripts(id)
-                );
-            """)
-            # Lightweight migration for analysis_results
-            want = {
-                "answer": "TEXT",
-                "reasoning": "TEXT",
-                "evidence": "TEXT",
-                "model": "TEXT",
-                "tokens_used": "INTEGER",
-                "analysis_date": "TIMESTAMP",
-            }
-            have = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(analysis_results);")}
-            for col, sqltype in want.items():
-                if col not in have:
-                    conn.execute(f"ALTER TABLE analysis_results ADD COLUMN {col} {sqltype};")
-            conn.commit()
+        with self._write_conn() as conn:
+            init_schema(conn)
 
     def _fetchone(self, query: str, params: Tuple[Any, ...]) -> Optional[sqlite3.Row]:
-        with _connect(self.db_path) as conn:
+        with self._read_conn() as conn:
             cur = conn.execute(query, params)
             return cur.fetchone()
 
     def list_available_transcripts(self, limit: int = 15) -> List[sqlite3.Row]:
         """Return recent transcript records, up to `limit`."""
-        sql = """
-            SELECT id, video_id, video_title, channel_name, extraction_date
-            FROM transcripts
-            ORDER BY extraction_date DESC
-            LIMIT ?
-        """
-        with _connect(self.db_path) as conn:
-            return conn.execute(sql, (limit,)).fetchall()
+        with self._read_conn() as conn:
+            return conn.execute(self._SQL_RECENT, (limit,)).fetchall()
 
     def get_transcript_by_id(self, tid: int) -> Optional[sqlite3.Row]:
-        return self._fetchone("SELECT * FROM transcripts WHERE id = ?", (tid,))
+        return self._fetchone(self._SQL_BY_ID, (tid,))
 
     def get_transcript_by_video_id(self, video_id: str) -> Optional[sqlite3.Row]:
-        return self._fetchone(
-            "SELECT * FROM transcripts WHERE video_id = ? ORDER BY extraction_date DESC LIMIT 1", (video_id,),
+        # ux_transcripts_video_id guarantees at most one row: a single index probe
+        return self._fetchone(self._SQL_BY_VID, (video_id,))
+
+    def exists_transcript(self, video_id: str) -> bool:
+        """True if a transcript for *video_id* is stored (no row data is read)."""
+        return self._fetchone(self._SQL_EXISTS, (video_id,)) is not None
+
+    def load_transcript_text(self, tid: int) -> Optional[str]:
+        """Return only the transcript text for transcript *tid*."""
+        row = self._fetchone(self._SQL_TEXT, (tid,))
+        return row_transcript_text(row) if row is not None else None
+
+    def _transcript_text(self, transcript_rec: sqlite3.Row) -> str:
+        """Text of *transcript_rec*; read from the DB unless the row already carries it."""
+        if "transcript_text" in transcript_rec.keys():  # full row, e.g. from upsert_and_fetch
+            return row_transcript_text(transcript_rec)
+        return self.load_transcript_text(transcript_rec["id"]) or ""
+
+    def last_verdict_for_video(self, video_id: str) -> Optional[GenocideVerdict]:
+        """Most recent stored verdict for *video_id*, or None if never analysed."""
+        row = self._fetchone(self._SQL_LAST_VERDICT, (video_id,))
+        if row is None:
+            return None
+        return GenocideVerdict(
+            answer=row["answer"],
+            reasoning=row["reasoning"] or "",
+            evidence=_json_loads(row["evidence"]) if row["evidence"] else [],
+            model=row["model"],
+            tokens_used=row["tokens_used"],
+            video_title=row["video_title"],
+            timestamp=datetime.fromisoformat(row["analysis_date"]) if row["analysis_date"] else None,
         )
 
-    def _save_result(self, transcript_id: int, verdict: GenocideVerdict) -> None:
-        with _connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO analysis_results (
-                    transcript_id, answer, reasoning, evidence, model, tokens_used, analysis_date
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+    def _flag_video_ids(self, video_ids: List[str], where: str) -> Dict[str, bool]:
+        """Map each of *video_ids* to whether a transcripts row ``t`` matching *where* exists."""
+        found = dict.fromkeys(video_ids, False)
+        ids = list(found)
+        with self._read_conn() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                for (video_id,) in conn.execute(
+                    f"SELECT t.video_id FROM transcripts t WHERE t.video_id IN ({marks}){where}",
+                    chunk,
+                ):
+                    found[video_id] = True
+        return found
+
+    def check_many_stored(self, video_ids: List[str]) -> Dict[str, bool]:
+        """Map each of *video_ids* to whether a transcript is stored, in one query per 500 IDs."""
+        return self._flag_video_ids(video_ids, "")
+
+    def check_many_analyzed(self, video_ids: List[str]) -> Dict[str, bool]:
+        """Map each of *video_ids* to whether a verdict is stored, in one query per 500 IDs."""
+        return self._flag_video_ids(
+            video_ids,
+            " AND EXISTS (SELECT 1 FROM analysis_results ar WHERE ar.transcript_id = t.id)",
+        )
+
+    def upsert_and_fetch(
+        self,
+        video_id: str,
+        *,
+        video_title: Optional[str],
+        channel_name: Optional[str],
+        transcript_text: str,
+        transcript_language: Optional[str] = None,
+    ) -> sqlite3.Row:
+        """Insert or replace the transcript for *video_id* and return the stored row."""
+        stored_text, compressed = pack_transcript_text(transcript_text)
+        with self._write_conn() as conn:
+            row = conn.execute(self._SQL_UPSERT, (
+                video_id,
+                video_title,
+                channel_name,
+                stored_text,
+                transcript_language,
+                hashlib.sha256(transcript_text.encode("utf-8")).hexdigest(),
+                compressed,
+            )).fetchone()
+            conn.commit()
+        return row
+
+    def _save_results_bulk(self, items: List[Tuple[int, GenocideVerdict]]) -> None:
+        """Insert many (transcript_id, verdict) rows in one transaction (one fsync)."""
+        now = datetime.utcnow()  # only for verdicts that carry no timestamp
+        rows = (
+            (
                 transcript_id,
                 verdict.answer,
                 verdict.reasoning,
-                json.dumps(verdict.evidence, ensure_ascii=False),
+                _json_dumps(verdict.evidence),
                 verdict.model,
                 verdict.tokens_used,
-                (verdict.timestamp or datetime.utcnow()).isoformat(),
-            ))
+                (verdict.timestamp or now).isoformat(),
+            )
+            for transcript_id, verdict in items
+        )
+        with self._write_conn() as conn:
+            conn.executemany(self._SQL_SAVE_RESULT, rows)
             conn.commit()
 
-    async def analyze(self, transcript_rec: sqlite3.Row) -> GenocideVerdict:
-        """Run the OpenAI genocide-incitement analysis and return a verdict."""
-        transcript_text = transcript_rec["transcript_text"] or ""
-        if len(transcript_text) > 90_000:
-            transcript_text = transcript_text[:90_000] + "… [truncated]"
+    async def _save_grouped(self, transcript_id: int, verdict: GenocideVerdict) -> None:
+        """Queue a verdict for the next group commit and wait until it is stored.
+
+        Concurrent analyses that finish while a commit runs are written
+        together by the following one – one transaction (and fsync) per
+        group instead of one per verdict.
+        """
+        self._save_queue.append((transcript_id, verdict))
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.ensure_future(self._flush_saves())
+        await asyncio.shield(self._save_task)
+
+    async def _flush_saves(self) -> None:
+        while self._save_queue:
+            batch, self._save_queue = self._save_queue, []
+            await asyncio.to_thread(self._save_results_bulk, batch)
 
-        user_content = (
+    def start_warmup(self) -> None:
+        """Open the API connection in the background (call from a running loop).
+
+        DNS + TCP + TLS then overlap with transcript work instead of
+        delaying the first analysis; `analyze()` awaits it before querying.
+        """
+        if self._warmup is None:
+            self._warmup = asyncio.create_task(self._warm_connection())
+
+    async def _warm_connection(self) -> None:
+        try:
+            await self.async_client.models.retrieve(self.model)
+        except Exception as exc:  # noqa: BLE001 – best effort only
+            logger.debug("OpenAI connection warm-up failed: %s", exc)
+
+    def _build_user_content(self, transcript_rec: sqlite3.Row) -> str:
+        """Render the user message (video header + possibly truncated transcript)."""
+        transcript_text = _truncate_transcript(self._transcript_text(transcript_rec), self.model)
+
+        return (
             f"Video: {transcript_rec['video_title']}\n"
             f"Channel: {transcript_rec['channel_name']}\n\n"
             f"Transcript:\n{transcript_text}"
         )
-        system_prompt = construct_genocide_analysis_prompt()
 
-        progress = Progress(
-            SpinnerColumn(),
-            TextColumn("{task.description}"),
-            BarColumn(),
-            transient=True,
-        )
-        task_id = progress.add_task("[bold green]Querying OpenAI…", total=None)
-        progress.start()
-        try:
-            response = await asyncio.to_thread(
-                self.client.responses.create,
-                model=self.model,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_content},
-                ],
-                response_format={"type": "json_object"},
+    @staticmethod
+    def _parse_verdict(raw: str) -> GenocideVerdict:
+        """Validate the model's JSON output into a GenocideVerdict."""
+        if msgspec is not None:
+            # Typed decode: no intermediate dict, no second validation pass
+            try:
+                msg = _verdict_decoder.decode(raw)
+            except msgspec.DecodeError as exc:  # ValidationError subclasses it
+                logger.error("OpenAI output parse failed: %s", exc, exc_info=True)
+                raise RuntimeError("Model returned invalid JSON – see logs.") from exc
+            return GenocideVerdict.model_construct(
+                answer=msg.answer, reasoning=msg.reasoning, evidence=msg.evidence
             )
-        finally:
-            progress.stop()
-
-        raw = response.output_text
         try:
-            parsed = json.loads(raw)
-            verdict = GenocideVerdict(**parsed)
-        except (json.JSONDecodeError, ValidationError) as exc:
+            # pydantic-core parses and validates in one pass (no dict round-trip)
+            return GenocideVerdict.model_validate_json(raw)
+        except ValidationError as exc:  # also raised for malformed JSON
             logger.error("OpenAI output parse failed: %s", exc, exc_info=True)
             raise RuntimeError("Model returned invalid JSON – see logs.") from exc
 
+    def _verdict_for_same_text(
+        self, transcript_rec: sqlite3.Row
+    ) -> Optional[Tuple[int, GenocideVerdict]]:
+        """(source transcript id, copy of its newest verdict) for an identical
+        transcript other than *transcript_rec*, if any.
+
+        The copy carries no ``tokens_used``: reusing it spends none.
+        """
+        digest = transcript_rec["transcript_sha256"]
+        if not digest:
+            return None
+        row = self._fetchone(self._SQL_VERDICT_BY_HASH, (digest, transcript_rec["id"]))
+        if row is None:
+            return None
+        verdict = GenocideVerdict(
+            answer=row["answer"],
+            reasoning=row["reasoning"] or "",
+            evidence=_json_loads(row["evidence"]) if row["evidence"] else [],
+            model=row["model"],
+            video_title=transcript_rec["video_title"],
+            timestamp=datetime.utcnow(),
+        )
+        logger.info("Reusing verdict of transcript %s (identical text)", row["transcript_id"])
+        return row["transcript_id"], verdict
+
+    async def analyze(
+        self,
+        transcript_rec: sqlite3.Row,
+        *,
+        show_progress: bool = True,
+        save: bool = True,
+        reuse: bool = True,
+    ) -> GenocideVerdict:
+        """Run the OpenAI genocide-incitement analysis and return a verdict.
+
+        Pass ``show_progress=False`` when several analyses run concurrently –
+        Rich allows only one live spinner at a time. With ``save=False`` the
+        caller persists the verdict itself (e.g. in bulk). Unless ``reuse`` is
+        False, a transcript whose text was already analysed (same SHA-256)
+        gets that verdict back without an API call.
+        """
+        if reuse and (reused := self._verdict_for_same_text(transcript_rec)) is not None:
+            source_id, verdict = reused
+            if save and source_id != transcript_rec['id']:
+                await self._save_grouped(transcript_rec['id'], verdict)
+            return verdict
+
+        user_content = self._build_user_content(transcript_rec)
+        system_prompt = self.system_prompt
+
+        if self._warmup is not None:
+            warmup, self._warmup = self._warmup, None
+            with suppress(Exception):
+                await warmup
+
+        if show_progress:
+            with _new_progress() as progress:
+                progress.add_task("[bold green]Querying OpenAI…", total=None)
+                response = await self._create_response(system_prompt, user_content)
+        else:
+            response = await self._create_response(system_prompt, user_content)
+
+        verdict = self._parse_verdict(response.output_text)
         verdict.model = getattr(response, "model", None)
         verdict.tokens_used = getattr(response.usage, "total_tokens", None)
+        details = getattr(response.usage, "input_tokens_details", None)
+        logger.debug("Prompt cache: %s cached input tokens", getattr(details, "cached_tokens", None))
         verdict.video_title = transcript_rec['video_title']
         verdict.timestamp = datetime.utcnow()
 
-        self._save_result(transcript_rec['id'], verdict)
+        if save:
+            # Committed on a worker thread (grouped with any concurrent verdicts)
+            # so other analyses keep running
+            await self._save_grouped(transcript_rec['id'], verdict)
         return verdict
 
+    async def _create_response(self, system_prompt: str, user_content: str) -> Any:
+        """Throttled `responses.create` with back-off retries on 429s and timeouts."""
+        from openai import APITimeoutError, RateLimitError
+
+        # ~4 chars per token for the prompt, plus headroom for the verdict
+        estimated_tokens = (len(system_prompt) + len(user_content)) // 4 + 2048
+        timeouts = 0
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            if self._limiter is not None:
+                await self._limiter.acquire(estimated_tokens)
+            try:
+                async with self._api_sem:
+                    return await self.async_client.responses.create(
+                        model=self.model,
+                        input=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_content},
+                        ],
+                        text={"format": {"type": "json_object"}},
+                        prompt_cache_key=_PROMPT_CACHE_KEY,
+                    )
+            except RateLimitError:
+                if attempt == _RATE_LIMIT_RETRIES:
+                    raise
+                reason = "rate limit hit"
+            except APITimeoutError:
+                timeouts += 1
+                if timeouts > _TIMEOUT_RETRIES or attempt == _RATE_LIMIT_RETRIES:
+                    raise
+                reason = "request timed out"
+            delay = min(2**attempt, _RATE_LIMIT_MAX_DELAY) + random.uniform(0, 1)
+            logger.warning("OpenAI %s; retrying in %.1fs", reason, delay)
+            await asyncio.sleep(delay)
+
+    async def analyze_many(
+        self,
+        transcript_recs: List[sqlite3.Row],
+        concurrency: Optional[int] = None,
+        *,
+        show_progress: bool = False,
+        reuse: bool = True,
+    ) -> List[GenocideVerdict | BaseException]:
+        """Analyse stored transcript rows concurrently.
+
+        At most *concurrency* analyses run at once (default: OPENAI_CONCURRENCY,
+        which also caps API calls across every caller). Results follow
+        *transcript_recs* order; a failed analysis yields its exception
+        instead of a verdict. Verdicts are group-committed as they finish
+        (see `_save_grouped`), so an interrupted run keeps what it paid for.
+        ``show_progress`` draws one bar for the whole run.
+        """
+        sem = asyncio.Semaphore(max(concurrency or settings.openai_concurrency, 1))
+        progress = _new_progress(disable=not show_progress)
+        task_id = progress.add_task("[bold green]Analysing transcripts…", total=len(transcript_recs))
+
+        async def one(rec: sqlite3.Row) -> GenocideVerdict:
+            try:
+                async with sem:
+                    return await self.analyze(rec, show_progress=False, reuse=reuse)
+            finally:
+                progress.advance(task_id)
+
+        with progress:
+            return await asyncio.gather(*(one(r) for r in transcript_recs), return_exceptions=True)
+
+    async def iter_pending_transcripts(self, chunk_size: int = 64) -> AsyncIterator[sqlite3.Row]:
+        """Yield every transcript without a stored verdict, *chunk_size* rows per DB read.
+
+        Uses its own read-only connection (the cursor stays open for the whole
+        iteration) and fetches on a worker thread, so the event loop keeps
+        running analyses while the next chunk is read.
+        """
+        conn = await asyncio.to_thread(_open_connection, self.db_path, read_only=True)
+        try:
+            cur = await asyncio.to_thread(conn.execute, self._SQL_PENDING)
+            while rows := await asyncio.to_thread(cur.fetchmany, chunk_size):
+                for row in rows:
+                    yield row
+        finally:
+            conn.close()
+
+    async def analyze_pending(
+        self,
+        concurrency: Optional[int] = None,
+        flush_every: int = 64,
+        on_verdict: Optional[Callable[[sqlite3.Row, GenocideVerdict], None]] = None,
+    ) -> int:
+        """Analyse every not-yet-analysed transcript; return how many verdicts were stored.
+
+        A producer streams rows into a bounded queue and *concurrency* workers
+        drain it, so memory stays flat however many transcripts are pending.
+        Verdicts are committed in groups of *flush_every*; failures are logged.
+        *on_verdict* is called with each row and its verdict as it arrives.
+        """
+        workers = max(concurrency or settings.openai_concurrency, 1)
+        pending: "asyncio.Queue[Optional[sqlite3.Row]]" = asyncio.Queue(maxsize=workers * 2)
+        done: List[Tuple[int, GenocideVerdict]] = []
+        stored = 0
+
+        async def flush() -> None:
+            nonlocal done, stored
+            batch, done = done, []
+            await asyncio.to_thread(self._save_results_bulk, batch)
+            stored += len(batch)
+
+        async def produce() -> None:
+            try:
+                async for rec in self.iter_pending_transcripts():
+                    await pending.put(rec)
+            finally:
+                for _ in range(workers):
+                    await pending.put(None)
+
+        async def work() -> None:
+            while (rec := await pending.get()) is not None:
+                try:
+                    verdict = await self.analyze(rec, show_progress=False, save=False)
+                except Exception as exc:  # noqa: BLE001 – keep the other workers going
+                    logger.error("Analysis failed for %s: %s", rec["video_id"], exc)
+                    continue
+                done.append((rec["id"], verdict))
+                if on_verdict is not None:
+                    on_verdict(rec, verdict)
+                if len(done) >= flush_every:
+                    await flush()
+
+        try:
+            await asyncio.gather(produce(), *(work() for _ in range(workers)))
+        finally:
+            if done:
+                await flush()
+        return stored
+
+    # ── Batch API (50% cheaper, completes within 24h) ──────────────────────
+
+    def build_batch_request(self, transcript_rec: sqlite3.Row) -> Dict[str, Any]:
+        """Return one Batch API JSONL line for *transcript_rec*, keyed by transcript ID."""
+        return {
+            "custom_id": str(transcript_rec["id"]),
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": {
+                "model": self.model,
+                "input": [
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": self._build_user_content(transcript_rec)},
+                ],
+                "text": {"format": {"type": "json_object"}},
+                "prompt_cache_key": _PROMPT_CACHE_KEY,
+            },
+        }
 
-# Minimal Typer CLI – list transcripts
-app = typer.Typer(add_completion=False, help="Minimal CLI to list stored transcripts.")
+    def submit_batch(self, transcript_recs: List[sqlite3.Row], jsonl_path: Optional[Path] = None) -> str:
+        """Upload *transcript_recs* as a JSONL batch, start the job and record it in batch_jobs.
+
+        The JSONL is built in memory; pass *jsonl_path* to also keep a copy on disk.
+        """
+        buf = io.BytesIO()
+        for rec in transcript_recs:
+            buf.write(_json_dumps(self.build_batch_request(rec)).encode("utf-8") + b"\n")
+        payload = buf.getvalue()
+        if jsonl_path is not None:
+            jsonl_path.write_bytes(payload)
+
+        batch_file = self.client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+        with self._write_conn() as conn:
+            conn.execute(
+                self._SQL_BATCH_SUBMITTED,
+                (batch.id, batch_file.id, len(transcript_recs), batch.status, datetime.utcnow().isoformat()),
+            )
+            conn.commit()
+        logger.info("Submitted batch %s (%d requests)", batch.id, len(transcript_recs))
+        return batch.id
+
+    def wait_for_batch(self, batch_id: str, *, initial_delay: float = 10.0, max_delay: float = 300.0) -> Any:
+        """Poll *batch_id* with exponential backoff until it reaches a terminal state."""
+        delay = initial_delay
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in _BATCH_TERMINAL_STATES:
+                with self._write_conn() as conn:
+                    conn.execute(
+                        self._SQL_BATCH_FINISHED,
+                        (batch.status, batch.output_file_id, datetime.utcnow().isoformat(), batch_id),
+                    )
+                    conn.commit()
+                return batch
+            logger.info("Batch %s is %s; checking again in %.0fs", batch_id, batch.status, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    def ingest_batch_results(self, batch: Any) -> List[Tuple[str, GenocideVerdict]]:
+        """Stream a finished batch's output file and bulk-insert one verdict per video."""
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} finished with status {batch.status!r}.")
+
+        # Every verdict in the file shares the batch's completion time
+        completed_at = getattr(batch, "completed_at", None)
+        finished = datetime.utcfromtimestamp(completed_at) if completed_at else datetime.utcnow()
+
+        parsed: List[Tuple[int, GenocideVerdict]] = []
+        content = self.client.files.content(batch.output_file_id)
+        for line in content.iter_lines():
+            if not line.strip():
+                continue
+            item = _json_loads(line)
+            custom_id = item["custom_id"]
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                logger.error("Batch request %s failed: %s", custom_id, item.get("error") or response)
+                continue
+
+            body = response["body"]
+            try:
+                verdict = self._parse_verdict(_response_output_text(body))
+            except RuntimeError:
+                continue
+            verdict.model = body.get("model")
+            verdict.tokens_used = (body.get("usage") or {}).get("total_tokens")
+            verdict.timestamp = finished
+            parsed.append((int(custom_id), verdict))
+
+        # One query for every referenced transcript instead of a lookup per line
+        known: Dict[int, sqlite3.Row] = {}
+        ids = [tid for tid, _ in parsed]
+        with self._read_conn() as conn:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT id, video_id, video_title FROM transcripts WHERE id IN ({marks})", chunk
+                ):
+                    known[row["id"]] = row
+
+        stored: List[Tuple[int, GenocideVerdict]] = []
+        results: List[Tuple[str, GenocideVerdict]] = []
+        for tid, verdict in parsed:
+            rec = known.get(tid)
+            if rec is None:
+                logger.error("Batch result for unknown transcript %s; skipping.", tid)
+                continue
+            verdict.video_title = rec["video_title"]
+            stored.append((tid, verdict))
+            results.append((rec["video_id"], verdict))
+
+        self._save_results_bulk(stored)
+        return results
+
+    def unfinished_batches(self) -> List[str]:
+        """IDs of submitted batches whose results were never collected, newest first."""
+        with self._read_conn() as conn:
+            return [row["batch_id"] for row in conn.execute(self._SQL_BATCH_UNFINISHED)]
+
+    def poll_and_ingest(self, batch_id: str) -> List[Tuple[str, GenocideVerdict]]:
+        """Wait for *batch_id* to finish, then store and return its verdicts."""
+        return self.ingest_batch_results(self.wait_for_batch(batch_id))
+
+    def analyze_batch(self, transcript_ids: List[int]) -> List[Tuple[str, GenocideVerdict]]:
+        """Analyse stored transcripts through the Batch API (blocks until done)."""
+        recs = [rec for tid in transcript_ids if (rec := self.get_transcript_by_id(tid)) is not None]
+        if not recs:
+            return []
+        return self.poll_and_ingest(self.submit_batch(recs))
+
+
+def _new_progress(*, disable: bool = False) -> "Progress":
+    """Transient spinner + bar used for analysis progress."""
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        transient=True,
+        disable=disable,
+    )
+
+
+def _response_output_text(body: Dict[str, Any]) -> str:
+    """Concatenate the output_text parts of a raw Responses API body."""
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output") or []
+        if item.get("type") == "message"
+        for part in item.get("content") or []
+        if part.get("type") == "output_text"
+    )
+
+
+# Minimal Typer CLI – list transcripts.  Typer and Rich are imported only
+# when the CLI runs, so importing TranscriptAnalyzer never loads them.
 _analyzer: Optional[TranscriptAnalyzer] = None
 
 def _get_analyzer() -> TranscriptAnalyzer:
@@ -214,11 +899,11 @@ def _get_analyzer() -> TranscriptAnalyzer:
         _analyzer = TranscriptAnalyzer()
     return _analyzer
 
-@app.command(name="list")
-def list_transcripts(
-    limit: int = typer.Option(10, "--limit", "-n", help="Number of transcripts to list")
-):
+def list_transcripts(limit: int = 10) -> None:
     """Show the most recent transcripts in the local DB."""
+    import typer
+    from rich import print as rprint
+
     rows = _get_analyzer().list_available_transcripts(limit)
     if not rows:
         rprint("[yellow]No transcripts found. Run the extractor first.")
@@ -227,5 +912,23 @@ def list_transcripts(
         date = r['extraction_date'].split("T")[0]
         rprint(f"[cyan]{r['id']:>4}[/] | {date} | {r['video_title']}")
 
+def _build_app() -> "typer.Typer":
+    import typer
+
+    app = typer.Typer(add_completion=False, help="Minimal CLI to list stored transcripts.")
+
+    @app.command(name="list")
+    def _list(
+        limit: int = typer.Option(10, "--limit", "-n", help="Number of transcripts to list")
+    ):
+        """Show the most recent transcripts in the local DB."""
+        list_transcripts(limit)
+
+    return app
+
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    _build_app()()
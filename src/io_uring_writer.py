@@ -0,0 +1,126 @@
+# io_uring_writer.py – batched result-file writes via io_uring
+# ------------------------------------------------------------
+# Writing one small JSON file per video costs a write() syscall each.  On
+# Linux with the optional `liburing` binding we queue every write as an
+# SQE and submit the whole batch with a single io_uring_submit(), then
+# reap the completions.  Elsewhere (or without liburing) we fall back to a
+# plain synchronous write so callers never need to care.
+# ------------------------------------------------------------
+
+from __future__ import annotations
+
+import logging
+import os
+from contextlib import suppress
+from pathlib import Path
+from typing import List, Tuple
+
+try:  # Linux-only optional dependency
+    import liburing  # type: ignore
+except ImportError:  # pragma: no cover – platform dependent
+    liburing = None
+
+logger = logging.getLogger(__name__)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write to a sibling temp file, then rename – readers never see a partial file."""
+    tmp = _tmp_path(path)
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def uring_available() -> bool:
+    """True when io_uring-backed writes can be used on this host."""
+    return liburing is not None
+
+
+class UringResultWriter:
+    """Buffer whole-file writes and flush them through one io_uring submission.
+
+    Usage::
+
+        with UringResultWriter() as writer:
+            for path, blob in results:
+                writer.submit_write(path, blob)
+        # all files written (and closed) on exit
+    """
+
+    def __init__(self, max_batch: int = 256):
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Path, bytes]] = []
+
+    def submit_write(self, path: Path, data: bytes) -> None:
+        """Queue *data* to be written to *path*; flushes once ``max_batch`` is reached."""
+        self._pending.append((Path(path), data))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued file and clear the queue.
+
+        Each file is written to a sibling ``.tmp`` and renamed over *path*
+        once complete, so readers never see a partial file.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if liburing is None:
+            for path, data in pending:
+                write_atomic(path, data)
+            return
+        self._flush_uring(pending)
+
+    def _flush_uring(self, pending: List[Tuple[Path, bytes]]) -> None:
+        ring = liburing.Ring()
+        cqe = liburing.Cqe()
+        tmps = [_tmp_path(path) for path, _ in pending]
+        fds: List[int] = []
+        replaced = set()
+        liburing.io_uring_queue_init(len(pending), ring)
+        try:
+            for idx, (_, data) in enumerate(pending):
+                fd = os.open(tmps[idx], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                fds.append(fd)
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_write(sqe, fd, data, 0)
+                sqe.user_data = idx
+            liburing.io_uring_submit(ring)
+
+            for _ in pending:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                idx, res = entry.user_data, entry.res
+                liburing.io_uring_cqe_seen(ring, entry)
+                path, data = pending[idx]
+                if res < 0:
+                    raise OSError(-res, os.strerror(-res), str(path))
+                if res != len(data):
+                    # Short write – finish the remainder synchronously.
+                    logger.debug(
+                        "Short io_uring write for %s (%d/%d)", path, res, len(data)
+                    )
+                    os.pwrite(fds[idx], data[res:], res)
+                os.close(fds[idx])
+                fds[idx] = -1
+                os.replace(tmps[idx], path)
+                replaced.add(idx)
+        finally:
+            for fd in fds:
+                if fd >= 0:
+                    os.close(fd)
+            liburing.io_uring_queue_exit(ring)
+            for idx, tmp in enumerate(tmps[: len(fds)]):
+                if idx not in replaced:
+                    with suppress(OSError):
+                        os.unlink(tmp)
+
+    def __enter__(self) -> "UringResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
@@ -0,0 +1,68 @@
+# rate_limit.py – proactive OpenAI request/token throttling
+# ----------------------------------------------------------
+# Two token buckets (requests per minute, tokens per minute) refilled
+# continuously.  Callers `await limiter.acquire(estimated_tokens)` before
+# each API request, so bulk runs dispatch at the account's RPM/TPM ceiling
+# instead of bouncing off 429s and sleeping through retry back-offs.
+# Modelled on the OpenAI cookbook's api_request_parallel_processor.
+# ----------------------------------------------------------
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Async RPM + TPM token bucket. A limit of 0 disables that bucket."""
+
+    def __init__(self, max_requests_per_minute: float, max_tokens_per_minute: float):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed, self._last_update = now - self._last_update, now
+        self.available_request_capacity = min(
+            self.available_request_capacity
+            + elapsed * self.max_requests_per_minute / 60.0,
+            self.max_requests_per_minute,
+        )
+        self.available_token_capacity = min(
+            self.available_token_capacity + elapsed * self.max_tokens_per_minute / 60.0,
+            self.max_tokens_per_minute,
+        )
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """Wait until one request and *estimated_tokens* fit, then reserve them."""
+        # A single request larger than the whole TPM budget would never fit.
+        tokens = min(estimated_tokens, self.max_tokens_per_minute)
+        async with self._lock:  # FIFO: waiters are served in arrival order
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.max_requests_per_minute and self.available_request_capacity < 1:
+                    wait = (
+                        (1 - self.available_request_capacity)
+                        * 60.0
+                        / self.max_requests_per_minute
+                    )
+                if (
+                    self.max_tokens_per_minute
+                    and self.available_token_capacity < tokens
+                ):
+                    wait = max(
+                        wait,
+                        (tokens - self.available_token_capacity)
+                        * 60.0
+                        / self.max_tokens_per_minute,
+                    )
+                if wait <= 0:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= tokens
+                    return
+                await asyncio.sleep(wait)
@@ -0,0 +1,93 @@
+# results.py – storage steps shared by both CLIs
+# ----------------------------------------------
+# genocide_detect.py (Typer) and fast_cli.py (argparse) store transcripts
+# and write verdict files the same way through these helpers, so the two
+# front-ends can't drift apart.  Nothing here imports Typer or Rich, and
+# the transcript stack is loaded only when a transcript is stored.
+# ----------------------------------------------
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import orjson  # optional: ~10× faster JSON encoding
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+from config import settings
+
+from .io_uring_writer import write_atomic
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from .gpt import GenocideVerdict, TranscriptAnalyzer
+
+
+def _json_default(o: Any) -> Any:
+    """Fallback for types the JSON encoder can't serialise natively."""
+    if isinstance(o, BaseModel):
+        # Hand the encoder the field dict itself so it walks the model once,
+        # instead of model_dump() building a full copy first.
+        return o.__dict__
+    if isinstance(o, datetime):
+        return o.isoformat()
+    return str(o)
+
+
+def dump_json(data: Any) -> bytes:
+    """Indented UTF-8 JSON; uses orjson (C, native datetime) when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    if isinstance(data, BaseModel):
+        # pydantic-core serialises straight to JSON in one pass
+        return data.model_dump_json(indent=2).encode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode(
+        "utf-8"
+    )
+
+
+def result_path(video_id: str, verdict: GenocideVerdict) -> Path:
+    """Where the result file for *verdict* on *video_id* goes."""
+    return (
+        settings.results_dir
+        / f"analysis_{video_id}_{verdict.timestamp:%Y%m%d_%H%M%S}.json"
+    )
+
+
+def save_result(video_id: str, verdict: GenocideVerdict) -> Tuple[Path, bytes]:
+    """Write *verdict*'s result file; return its path and the encoded JSON."""
+    blob = dump_json(verdict)
+    path = result_path(video_id, verdict)
+    write_atomic(path, blob)
+    return path, blob
+
+
+def store_transcript(
+    analyzer: TranscriptAnalyzer,
+    video_id: str,
+    segments: Any,
+    language: Optional[str],
+) -> Tuple[sqlite3.Row, Path]:
+    """Write the transcript text file, then upsert the row; return the row and file."""
+    from .youtube_transcript import write_transcript_file
+
+    prepared = write_transcript_file(segments, video_id)
+    rec = analyzer.upsert_and_fetch(
+        video_id,
+        video_title=prepared.video_title,
+        channel_name=prepared.channel_name,
+        transcript_text=prepared.transcript_text,
+        transcript_language=language,
+    )
+    return rec, prepared.file_path
@@ -23,7 +23,7 @@ ANALYSIS_SCHEMA = {
 }
 
 
-def construct_genocide_analysis_prompt() -> str:
+def _build_prompt() -> str:
     """
     Create a system prompt for analyzing if a transcript constitutes incitement to genocide
     based on the Rome Statute definition.
@@ -85,4 +85,13 @@ def construct_genocide_analysis_prompt() -> str:
     prompt += json.dumps(ANALYSIS_SCHEMA, indent=2)
     prompt += "\n    </output_format>"
 
-    return prompt
\ No newline at end of file
+    return prompt
+
+
+# The prompt never changes at runtime; render it (and the schema JSON) once.
+_PROMPT = _build_prompt()
+
+
+def construct_genocide_analysis_prompt() -> str:
+    """Return the (pre-built) genocide-incitement system prompt."""
+    return _PROMPT
@@ -8,26 +8,30 @@
 
 from __future__ import annotations
 
-import json
+import atexit
 import logging
+import re
 import shutil
 import sqlite3
 import subprocess
 import sys
-from contextlib import contextmanager
-from datetime import datetime
-from pathlib import Path
-from typing import NamedTuple, Optional, Tuple
-from urllib.parse import parse_qs, urlparse
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Local imports
 from config import ensure_dirs_exist, settings
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-)
+
+# Resolved once: `shutil.which` stats every $PATH entry on each call.
+_YT_DLP_PATH: Optional[str] = shutil.which("yt-dlp")
+
 
 # ---------------------------------------------------------------------------
 # Types
@@ -40,45 +44,104 @@ class VideoMeta(NamedTuple):
 # ---------------------------------------------------------------------------
 # SQLite helper (private)
 # ---------------------------------------------------------------------------
-@contextmanager
-def _connect(db_path: Path):
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+_local = threading.local()
+
+
+def _close(conn: sqlite3.Connection) -> None:
+    """Refresh planner statistics (cheap no-op if nothing changed), then close."""
     try:
-        yield conn
-    finally:
-        conn.close()
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """This thread's long-lived cache connection (WAL, relaxed fsync, capped WAL file).
+
+    Opened on first use and closed at exit, so bulk look-ups keep the page
+    cache warm instead of reopening the database for every video.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(settings.db_path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        if str(settings.db_path) != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA journal_size_limit=67108864;")
+        _local.conn = conn
+        atexit.register(_close, conn)
+    return conn
+
+
+_table_ready = False  # DDL runs once per process, not on every lookup
 
 
 def _ensure_table(conn: sqlite3.Connection) -> None:
+    # New databases key the cache by video_id directly (WITHOUT ROWID): one
+    # b-tree descent per lookup. Existing tables are left as they are.
+    global _table_ready  # noqa: PLW0603
+    if _table_ready:
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS video_metadata (
             video_id TEXT PRIMARY KEY,
             video_title TEXT,
             channel_name TEXT,
-            fetch_date TIMESTAMP NOT NULL
-        );
+            fetch_date INTEGER NOT NULL  -- UNIX seconds (older rows: ISO text)
+        ) WITHOUT ROWID;
         """
     )
     conn.commit()
+    _table_ready = True
+
+
+# Statement texts are module constants so every call site hits the same
+# entry in the connection's prepared-statement cache.
+_SQL_GET = "SELECT video_title, channel_name FROM video_metadata WHERE video_id = ?"
+_SQL_PUT = "INSERT OR REPLACE INTO video_metadata VALUES (?, ?, ?, ?)"
+_SQL_GET_MANY = "SELECT video_id, video_title, channel_name FROM video_metadata WHERE video_id IN ({marks})"
 
 
 def _from_cache(conn: sqlite3.Connection, vid: str) -> Optional[VideoMeta]:
-    row = conn.execute(
-        "SELECT video_title, channel_name FROM video_metadata WHERE video_id = ?",
-        (vid,),
-    ).fetchone()
+    row = conn.execute(_SQL_GET, (vid,)).fetchone()
     if row:
         return VideoMeta(row[0], row[1])
     return None
 
 
+# In-process LRU of complete results in front of SQLite: repeat look-ups
+# (interactive flows, batches with duplicate IDs) skip the query entirely.
+# Incomplete results are not memoised so they are retried as before.
+_MEMO_MAX = 4096
+_memo: "OrderedDict[str, VideoMeta]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _memo_get(vid: str) -> Optional[VideoMeta]:
+    with _memo_lock:
+        meta = _memo.get(vid)
+        if meta is not None:
+            _memo.move_to_end(vid)
+        return meta
+
+
+def _memo_put(vid: str, meta: VideoMeta) -> None:
+    with _memo_lock:
+        if not all(meta):
+            _memo.pop(vid, None)  # mirror the cache row just written
+            return
+        _memo[vid] = meta
+        _memo.move_to_end(vid)
+        if len(_memo) > _MEMO_MAX:
+            _memo.popitem(last=False)
+
+
 def _to_cache(conn: sqlite3.Connection, vid: str, meta: VideoMeta) -> None:
-    conn.execute(
-        "INSERT OR REPLACE INTO video_metadata VALUES (?, ?, ?, ?)",
-        (vid, meta.title, meta.channel, datetime.utcnow().isoformat()),
-    )
+    conn.execute(_SQL_PUT, (vid, meta.title, meta.channel, int(time.time())))
     conn.commit()
 
 
@@ -86,20 +149,100 @@ def _to_cache(conn: sqlite3.Connection, vid: str, meta: VideoMeta) -> None:
 # Public helpers (main + backward-compat)
 # ---------------------------------------------------------------------------
 
+# oEmbed: one small JSON GET per video (title + channel), no subprocess and
+# no watch-page scrape. Unavailable/private videos answer 401/404.
+_OEMBED_URL = "https://www.youtube.com/oembed"
+_OEMBED_WORKERS = 32
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()  # the oEmbed worker threads race to build it
+
+
+def _get_session() -> requests.Session:
+    global _session  # noqa: PLW0603
+    if _session is not None:
+        return _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_OEMBED_WORKERS)
+            session.mount("https://", adapter)
+            if settings.https_proxy:
+                session.proxies = {"https": settings.https_proxy}
+            _session = session
+    return _session
+
+
+def _metadata_via_oembed(video_id: str) -> VideoMeta:
+    """Title + channel from YouTube's oEmbed endpoint; (None, None) on failure."""
+    try:
+        resp = _get_session().get(
+            _OEMBED_URL,
+            params={"url": f"https://www.youtube.com/watch?v={video_id}", "format": "json"},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        return VideoMeta(data.get("title"), data.get("author_name"))
+    except (requests.RequestException, ValueError) as exc:
+        logger.debug("oEmbed failed for %s: %s", video_id, exc)
+        return VideoMeta(None, None)
+
+
+def _metadata_many_via_oembed(video_ids: List[str]) -> Dict[str, VideoMeta]:
+    """oEmbed look-ups for many videos, up to 32 in flight on one pooled session."""
+    if len(video_ids) == 1:
+        return {video_ids[0]: _metadata_via_oembed(video_ids[0])}
+    with ThreadPoolExecutor(max_workers=min(_OEMBED_WORKERS, len(video_ids))) as pool:
+        return dict(zip(video_ids, pool.map(_metadata_via_oembed, video_ids)))
+
+
+# Only the fields we use: yt-dlp skips building the full JSON InfoDict
+# (formats, thumbnails, subtitles).  "|" gives an empty default instead of "NA".
+_YT_DLP_FIELDS = "%(id)s\t%(title|)s\t%(uploader,channel|)s"
+
+
+def _parse_yt_dlp_line(line: str) -> Tuple[str, VideoMeta]:
+    video_id, _, rest = line.partition("\t")
+    title, _, channel = rest.rpartition("\t")  # titles may contain tabs, IDs never
+    return video_id, VideoMeta(title or None, channel or None)
+
+
 def _metadata_via_yt_dlp(video_id: str) -> VideoMeta:
-    """Try yt-dlp JSON dump; returns (None, None) on failure."""
+    """Try yt-dlp's --print of title/uploader; returns (None, None) on failure."""
     try:
         cmd = [
-            "yt-dlp",
-            "--dump-json",
+            _YT_DLP_PATH or "yt-dlp",
+            "--print",
+            _YT_DLP_FIELDS,
             "--no-warnings",
             f"https://www.youtube.com/watch?v={video_id}",
         ]
         proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(proc.stdout)
-        return VideoMeta(data.get("title"), data.get("uploader") or data.get("channel"))
-    except (subprocess.CalledProcessError, json.JSONDecodeError):
+    except subprocess.CalledProcessError:
         return VideoMeta(None, None)
+    return _parse_yt_dlp_line(proc.stdout.rstrip("\n"))[1]
+
+
+def _iter_metadata_via_yt_dlp(video_ids: List[str]) -> Iterator[Tuple[str, VideoMeta]]:
+    """One yt-dlp process for many videos, yielding each as soon as it is printed.
+
+    Videos yt-dlp cannot resolve are omitted.
+    """
+    cmd = [
+        _YT_DLP_PATH or "yt-dlp",
+        "--print",
+        _YT_DLP_FIELDS,
+        "--no-warnings",
+        "--ignore-errors",  # keep going past unavailable videos
+        *(f"https://www.youtube.com/watch?v={vid}" for vid in video_ids),
+    ]
+    # Exit status is non-zero whenever any video failed; parse what we got.
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+    ) as proc:
+        for line in proc.stdout:
+            if "\t" in line:
+                yield _parse_yt_dlp_line(line.rstrip("\n"))
 
 
 def _metadata_via_pytube(video_id: str) -> VideoMeta:
@@ -117,24 +260,28 @@ def _metadata_via_pytube(video_id: str) -> VideoMeta:
 def get_video_metadata(video_id: str, *, use_cache: bool = True) -> VideoMeta:
     """Return `(title, channel)` for *video_id*.
 
-    Order: SQLite cache → yt-dlp → pytube.  Stores result in cache even if
-    incomplete to avoid repeat network calls.
+    Order: SQLite cache → oEmbed → yt-dlp → pytube.  Stores result in cache
+    even if incomplete to avoid repeat network calls.
     """
 
+    if use_cache and (memo := _memo_get(video_id)) is not None:
+        return memo
+
     ensure_dirs_exist()
 
     # 1) cache lookup
-    with _connect(settings.db_path) as conn:
-        _ensure_table(conn)
-        if use_cache:
-            cached = _from_cache(conn, video_id)
-            if cached and all(cached):
-                logger.debug("Cache hit for %s", video_id)
-                return cached
-
-    # 2) yt-dlp
-    meta = VideoMeta(None, None)
-    if shutil.which("yt-dlp"):
+    conn = _get_conn()
+    _ensure_table(conn)
+    if use_cache:
+        cached = _from_cache(conn, video_id)
+        if cached and all(cached):
+            logger.debug("Cache hit for %s", video_id)
+            _memo_put(video_id, cached)
+            return cached
+
+    # 2) oEmbed, then yt-dlp
+    meta = _metadata_via_oembed(video_id)
+    if not all(meta) and _YT_DLP_PATH:
         meta = _metadata_via_yt_dlp(video_id)
 
     # 3) pytube fallback if we’re missing any field
@@ -142,13 +289,78 @@ def get_video_metadata(video_id: str, *, use_cache: bool = True) -> VideoMeta:
         meta = _metadata_via_pytube(video_id)
 
     # 4) persist to cache (even if None/None) so we don’t retry instantly
-    with _connect(settings.db_path) as conn:
-        _ensure_table(conn)
-        _to_cache(conn, video_id, meta)
+    _to_cache(conn, video_id, meta)
+    _memo_put(video_id, meta)
 
     return meta
 
 
+def get_video_metadata_many(video_ids: Iterable[str], *, use_cache: bool = True) -> Dict[str, VideoMeta]:
+    """`get_video_metadata` for many IDs: one cache query, concurrent oEmbed
+    look-ups, one yt-dlp run for the leftovers, one commit.
+
+    Returns ``{video_id: VideoMeta}`` for every (distinct) ID; pytube is
+    tried per video only for those neither could resolve.
+    """
+    ensure_dirs_exist()
+    ids = list(dict.fromkeys(video_ids))
+    conn = _get_conn()
+    _ensure_table(conn)
+
+    # 1) cache lookup, one IN (...) query per 500 IDs
+    result: Dict[str, VideoMeta] = {}
+    if use_cache:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in conn.execute(_SQL_GET_MANY.format(marks=marks), chunk):
+                meta = VideoMeta(row[1], row[2])
+                if all(meta):
+                    result[row[0]] = meta
+    missing = [vid for vid in ids if vid not in result]
+    if not missing:
+        return result
+
+    # 2) oEmbed concurrently, then a single yt-dlp process for what it missed;
+    #    its rows are stored while it is still fetching later videos
+    fetched = _metadata_many_via_oembed(missing)
+    unresolved = [vid for vid, meta in fetched.items() if not all(meta)]
+    stored: set[str] = set()
+    if unresolved and _YT_DLP_PATH:
+        batch: List[Tuple[str, Optional[str], Optional[str], int]] = []
+        for vid, meta in _iter_metadata_via_yt_dlp(unresolved):
+            fetched[vid] = meta
+            if all(meta):
+                batch.append((vid, meta.title, meta.channel, int(time.time())))
+                stored.add(vid)
+            if len(batch) >= 100:
+                with conn:
+                    conn.executemany(_SQL_PUT, batch)
+                batch.clear()
+        if batch:
+            with conn:
+                conn.executemany(_SQL_PUT, batch)
+
+    # 3) pytube fallback per video still missing a field
+    for vid in missing:
+        meta = fetched.get(vid, VideoMeta(None, None))
+        if not all(meta):
+            meta = _metadata_via_pytube(vid)
+        fetched[vid] = meta
+
+    # 4) persist the rest (even None/None) in one transaction
+    now = int(time.time())
+    with conn:
+        conn.executemany(
+            _SQL_PUT,
+            ((vid, meta.title, meta.channel, now) for vid, meta in fetched.items() if vid not in stored),
+        )
+    for vid, meta in fetched.items():
+        _memo_put(vid, meta)
+    result.update(fetched)
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Backward compatibility shim
 # ---------------------------------------------------------------------------
@@ -167,17 +379,22 @@ def get_video_metadata_pytube(video_id: str) -> VideoMeta:  # noqa: N802 (legacy
 # Convenience helper for full URLs (strips query / playlist params)
 # ---------------------------------------------------------------------------
 
-def get_video_metadata_from_url(url: str, *, use_cache: bool = True) -> VideoMeta:
-    """Extract 11-char ID from an arbitrary YouTube URL then fetch metadata."""
+# Same shapes as youtube_transcript.extract_video_id (not imported: that
+# module imports this one). Bare 11-char IDs pass straight through.
+_VIDEO_ID_RE = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/v/|/live/)([A-Za-z0-9_-]{11})")
+_BARE_ID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
 
-    parsed = urlparse(url)
-    if parsed.hostname in {"youtu.be"}:  # short URL
-        vid = parsed.path.lstrip("/")
-    else:  # youtube.com/watch?v=…
-        vid = parse_qs(parsed.query).get("v", [""])[0]
 
-    if not vid:
-        raise ValueError("Could not extract video ID from URL")
+def get_video_metadata_from_url(url: str, *, use_cache: bool = True) -> VideoMeta:
+    """Extract 11-char ID from a YouTube URL (or bare ID) then fetch metadata."""
+
+    if len(url) == 11 and _BARE_ID_RE.fullmatch(url):
+        vid = url
+    else:
+        match = _VIDEO_ID_RE.search(url)
+        if not match:
+            raise ValueError("Could not extract video ID from URL")
+        vid = match.group(1)
 
     return get_video_metadata(vid, use_cache=use_cache)
 
@@ -188,9 +405,7 @@ def get_video_metadata_from_url(url: str, *, use_cache: bool = True) -> VideoMet
 
 def _interactive_flow() -> None:  # pragma: no cover
     url = input("Enter YouTube URL (or plain video ID): ").strip()
-    meta = (
-        get_video_metadata_from_url(url) if "http" in url else get_video_metadata(url)
-    )
+    meta = get_video_metadata_from_url(url)
 
     print("\nMetadata:\n--------")
     print(f"Title  : {meta.title or '[not found]'}")
@@ -198,12 +413,12 @@ def _interactive_flow() -> None:  # pragma: no cover
 
 
 if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
     if len(sys.argv) > 1:
-        meta = (
-            get_video_metadata_from_url(sys.argv[1])
-            if "http" in sys.argv[1]
-            else get_video_metadata(sys.argv[1])
-        )
+        meta = get_video_metadata_from_url(sys.argv[1])
         print(meta)
     else:
         _interactive_flow()
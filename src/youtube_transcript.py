@@ -9,18 +9,25 @@
 
 from __future__ import annotations
 
+import atexit
+import hashlib
+import io
 import logging
 import re as _re
 import sqlite3
-import urllib.request
-from contextlib import contextmanager
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from http.cookiejar import MozillaCookieJar
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from xml.etree.ElementTree import ParseError
 
 # ── third-party ───────────────────────────────────────────────────────────
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
     TranscriptsDisabled,
@@ -37,37 +44,67 @@ except Exception:  # pragma: no cover
 from config import settings, ensure_dirs_exist
 
 try:
+    from .io_uring_writer import UringResultWriter, uring_available
     from .youtube_metadata import (
         get_video_metadata,
+        get_video_metadata_many,
         get_video_metadata_pytube,
     )
 except ImportError:  # running as a script, not a module
+    from src.io_uring_writer import UringResultWriter, uring_available
     from src.youtube_metadata import (
         get_video_metadata,
+        get_video_metadata_many,
         get_video_metadata_pytube,
     )
 
 # ── logging setup ─────────────────────────────────────────────────────────
+# Handlers are left to the entry point (CLI / __main__); configuring them at
+# import would override the host application's logging setup.
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-)
 
 # ---------------------------------------------------------------------------
 # SQLite helpers
 # ---------------------------------------------------------------------------
 
 
-@contextmanager
-def _connect(db_path: Path):
-    """Context-managed connection with row dicts."""
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+_local = threading.local()
+
+
+def _open(db_path: Path) -> sqlite3.Connection:
+    """Tuned connection with row dicts (WAL, relaxed fsync, capped WAL file)."""
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    if str(db_path) != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA journal_size_limit=67108864;")
+    conn.execute("PRAGMA mmap_size=268435456;")
+    conn.execute("PRAGMA cache_size=-16384;")
+    return conn
+
+
+def _close(conn: sqlite3.Connection) -> None:
+    """Refresh planner statistics (cheap no-op if nothing changed), then close."""
     try:
-        yield conn
-    finally:
-        conn.close()
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+
+def _get_conn() -> sqlite3.Connection:
+    """This thread's long-lived connection (opened on first use, closed at exit).
+
+    Keeps SQLite's page cache warm and skips the open/close per saved
+    transcript when many videos are processed in one run.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _open(settings.db_path)
+        atexit.register(_close, conn)
+    return conn
 
 
 # ---------------------------------------------------------------------------
@@ -75,20 +112,20 @@ def _connect(db_path: Path):
 # ---------------------------------------------------------------------------
 
 
+# Compiled once: watch?v=, youtu.be/, /shorts/, /embed/, /v/ and /live/ forms
+_VIDEO_ID_RE = _re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/v/|/live/)([A-Za-z0-9_-]{11})")
+_BARE_ID_RE = _re.compile(r"[A-Za-z0-9_-]{11}")
+
+
+@lru_cache(maxsize=1024)  # batch files often repeat URLs; pure, so safe
 def extract_video_id(youtube_url: str) -> str:
-    """Return the 11-char YouTube video ID or raise ValueError."""
-    parsed = urlparse(youtube_url)
-    host = parsed.hostname or ""
-
-    if host in {"www.youtube.com", "youtube.com"}:
-        if parsed.path == "/watch":
-            return parse_qs(parsed.query).get("v", [""])[0]
-        if parsed.path.startswith("/embed/"):
-            return parsed.path.split("/")[2]
-        if parsed.path.startswith("/v/"):
-            return parsed.path.split("/")[2]
-    elif host == "youtu.be":
-        return parsed.path.lstrip("/")
+    """Return the 11-char YouTube video ID (from a URL or a bare ID) or raise ValueError."""
+    if len(youtube_url) == 11 and _BARE_ID_RE.fullmatch(youtube_url):
+        return youtube_url
+
+    match = _VIDEO_ID_RE.search(youtube_url)
+    if match:
+        return match.group(1)
 
     raise ValueError("Could not extract video ID from URL – unsupported format.")
 
@@ -98,6 +135,64 @@ def extract_video_id(youtube_url: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+_api: Optional[Any] = None  # shared YouTubeTranscriptApi (pooled HTTP session)
+_session: Optional[requests.Session] = None
+# fetch_transcripts_many's threads all reach the getters below at once;
+# re-entrant because _get_api builds the session under the same lock.
+_client_lock = threading.RLock()
+
+
+def _get_session() -> requests.Session:
+    """The pooled `requests.Session` behind every YouTube request in this module.
+
+    Shared by the transcript API and the yt-dlp fallback's VTT downloads, so
+    both reuse the same keep-alive TLS connections; transient connection
+    errors are retried with back-off.
+    """
+    global _session  # noqa: PLW0603
+    if _session is not None:
+        return _session
+    with _client_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if settings.youtube_cookies_path:
+                jar = MozillaCookieJar(str(settings.youtube_cookies_path))
+                jar.load(ignore_discard=True, ignore_expires=True)
+                session.cookies = jar  # type: ignore[assignment]
+            if settings.https_proxy:
+                session.proxies = {"http": settings.https_proxy, "https": settings.https_proxy}
+            _session = session
+    return _session
+
+
+def _get_api() -> Any:
+    """Build the transcript API client once, on the pooled `requests.Session`.
+
+    Proxy and cookies settings are applied here so every fetch (and the
+    TLS connection to YouTube) is reused across calls.
+    """
+    global _api  # noqa: PLW0603
+    if _api is not None:
+        return _api
+    with _client_lock:
+        if _api is None:
+            proxy_config = None
+            if settings.https_proxy:
+                from youtube_transcript_api.proxies import GenericProxyConfig
+
+                proxy_config = GenericProxyConfig(https_url=settings.https_proxy)
+
+            _api = YouTubeTranscriptApi(proxy_config=proxy_config, http_client=_get_session())
+    return _api
+
+
 def fetch_transcript(
     video_id: str, languages: Optional[List[str]] = None
 ) -> Tuple[List[Dict[str, Any]], str]:
@@ -120,108 +215,43 @@ def fetch_transcript(
 
     # 1) preferred languages (from config) → then try "any available"
     languages = languages or settings.youtube_languages or ["en", "en-GB", "en-US"]
-    transcript_language = "unknown"
 
     try:
-        # Build proxies/cookies args if provided
-        proxies = {"https": settings.https_proxy} if settings.https_proxy else None
-        cookies = (
-            str(settings.youtube_cookies_path)
-            if settings.youtube_cookies_path
-            else None
-        )
-
-        # First: try to get transcript in preferred languages (manual or generated)
-        transcript = YouTubeTranscriptApi.get_transcript(
-            video_id,
-            languages=languages,
-            proxies=proxies,
-            cookies=cookies,
-        )
-        transcript_language = languages[
-            0
-        ]  # Use the first requested language if successful
-        return transcript, transcript_language
-
+        transcript_list = _get_api().list(video_id)
     except (TranscriptsDisabled, VideoUnavailable) as exc:
         logger.error("Transcript API error for %s – %s", video_id, exc)
         raise
+    except Exception:  # noqa: BLE001
+        logger.exception("Unexpected error listing transcripts for %s", video_id)
+        return _fallback_with_ytdlp(video_id)
 
-    except NoTranscriptFound:
-        # If preferred languages aren't available, try to get a list of available languages
+    try:
+        # Preferred languages (manual before generated, as the API orders them)
         try:
-            proxies = {"https": settings.https_proxy} if settings.https_proxy else None
-            cookies = (
-                str(settings.youtube_cookies_path)
-                if settings.youtube_cookies_path
-                else None
-            )
-            transcript_list = YouTubeTranscriptApi.list_transcripts(
-                video_id,
-                proxies=proxies,
-                cookies=cookies,
-            )
-
+            transcript_obj = transcript_list.find_transcript(languages)
+        except NoTranscriptFound:
             # Log available languages for debug purposes
             available_langs = [
                 f"{t.language_code} ({t.language})" for t in transcript_list
             ]
             logger.info("Available transcripts for %s: %s", video_id, available_langs)
+            transcript_obj = None
 
-            # Prefer manual, then generated, then "first available"
-            try:
-                manual = transcript_list.find_manually_created_transcript(
-                    settings.youtube_languages
-                )
-                return manual.fetch(), manual.language_code
-            except Exception:
-                pass
-            try:
-                auto = transcript_list.find_generated_transcript(
-                    settings.youtube_languages
-                )
-                return auto.fetch(), auto.language_code
-            except Exception:
-                pass
-
-            # Otherwise iterate all and take the first one we can parse
-            for transcript_obj in transcript_list:
-                logger.info(
-                    "Using transcript in %s (%s)",
-                    transcript_obj.language,
-                    transcript_obj.language_code,
-                )
-                fetched_transcript = transcript_obj.fetch()
-
-                # Normal path: `fetch()` returns a list[dict]
-                transcript_data = (
-                    list(fetched_transcript)
-                    if not isinstance(fetched_transcript, list)
-                    else fetched_transcript
-                )
-
-                # If we successfully parsed any transcript data, return it
-                if transcript_data:
-                    return transcript_data, transcript_obj.language_code
-                else:
-                    logger.warning(
-                        f"Could not extract transcript data from {transcript_obj.language_code}"
-                    )
-                    continue
-
-            # If we get here, there were no transcripts in the list or none could be parsed
-            raise NoTranscriptFound(
-                video_id,
-                languages,
-                f"No transcripts found in list for video {video_id}",
+        candidates = [transcript_obj] if transcript_obj else list(transcript_list)
+        for candidate in candidates:
+            logger.info(
+                "Using transcript in %s (%s)", candidate.language, candidate.language_code
             )
-
-        except Exception as exc:
-            logger.error(
-                "Failed to fetch any transcript for %s via API list: %s", video_id, exc
+            fetched = candidate.fetch(preserve_formatting=False)
+            transcript_data = fetched.to_raw_data()
+            if transcript_data:
+                return transcript_data, candidate.language_code
+            logger.warning(
+                f"Could not extract transcript data from {candidate.language_code}"
             )
-            # ↓ Fall through to yt-dlp fallback before giving up
-            return _fallback_with_ytdlp(video_id)
+
+        # If we get here, there were no transcripts in the list or none could be parsed
+        raise NoTranscriptFound(video_id, languages, transcript_list)
 
     # Broken captions sometimes surface as XML parse failures
     except ParseError as exc:
@@ -230,12 +260,32 @@ def fetch_transcript(
         # Try yt-dlp last
         return _fallback_with_ytdlp(video_id)
 
-    # Anything we didn't anticipate
     except Exception as exc:  # noqa: BLE001
-        logger.exception("Unexpected error fetching transcript for %s", video_id)
+        logger.error("Failed to fetch any transcript for %s via API: %s", video_id, exc)
+        # ↓ Fall through to yt-dlp fallback before giving up
         return _fallback_with_ytdlp(video_id)
 
 
+def fetch_transcripts_many(
+    video_ids: Iterable[str],
+    languages: Optional[List[str]] = None,
+    max_workers: int = 16,
+) -> Iterator[Tuple[str, Union[Tuple[List[Dict[str, Any]], str], BaseException]]]:
+    """
+    `fetch_transcript` for many videos on a thread pool (network-bound, so
+    threads overlap the waits); the default matches the shared session's
+    16 pooled connections.
+
+    Yields ``(video_id, (segments, language))`` as each download finishes, or
+    ``(video_id, exception)`` for videos that failed.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transcript-fetch") as pool:
+        futures = {pool.submit(fetch_transcript, vid, languages): vid for vid in dict.fromkeys(video_ids)}
+        for future in as_completed(futures):
+            exc = future.exception()
+            yield futures[future], exc if exc is not None else future.result()
+
+
 # ---------------------- yt-dlp fallback ------------------------------------
 
 
@@ -298,72 +348,82 @@ def _fallback_with_ytdlp(video_id: str) -> Tuple[List[Dict[str, Any]], str]:
     if not vtt_url:
         raise NoTranscriptFound(video_id, langs, "yt-dlp captions had no URL")
 
+    # Parsed while it downloads, cue by cue: the VTT is never held whole
     try:
-        with urllib.request.urlopen(vtt_url) as resp:
-            vtt_text = resp.read().decode("utf-8", errors="replace")
+        with _get_session().get(vtt_url, stream=True, timeout=30) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True  # transparently gunzip
+            resp.raw.auto_close = False  # let TextIOWrapper see a clean EOF
+            segments = _vtt_lines_to_segments(io.TextIOWrapper(resp.raw, encoding="utf-8", errors="replace"))
     except Exception as exc:
         raise NoTranscriptFound(
             video_id, langs, f"Failed to download VTT: {exc}"
         ) from exc
 
-    segments = _vtt_to_segments(vtt_text)
     if not segments:
         raise NoTranscriptFound(video_id, langs, "VTT parsed to zero segments")
     logger.info("yt-dlp fallback succeeded for %s (%s)", video_id, chosen_lang)
     return segments, chosen_lang or "unknown"
 
 
+# Compiled once: the cue timing line "[hh:]mm:ss.mmm --> [hh:]mm:ss.mmm
+# [cue settings]", split into its integer fields so no float()/split() is
+# needed per timestamp.
+_VTT_TIMING_RE = _re.compile(
+    r"^(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})[ \t]*-->[ \t]*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})[^\n]*$",
+    _re.MULTILINE,
+)
+
+
 def _vtt_to_segments(vtt_text: str) -> List[Dict[str, Any]]:
     """
     Very small VTT → segments converter: returns [{'text','start','duration'}, ...]
     Assumes well-formed cue timings like '00:01.234 --> 00:03.000'
     """
+    return _vtt_lines_to_segments(vtt_text.splitlines())
 
-    def _ts_to_seconds(ts: str) -> float:
-        # hh:mm:ss.mmm or mm:ss.mmm
-        parts = ts.split(":")
-        if len(parts) == 3:
-            h, m, s = parts
-            return int(h) * 3600 + int(m) * 60 + float(s.replace(",", "."))
-        m, s = parts
-        return int(m) * 60 + float(s.replace(",", "."))
 
+def _vtt_lines_to_segments(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """`_vtt_to_segments` over any line iterable (e.g. a streaming response),
+    holding only the current cue in memory."""
     segments: List[Dict[str, Any]] = []
-    # split on blank lines to get cues
-    for block in _re.split(r"\n\s*\n", vtt_text.strip()):
-        lines = [ln.strip() for ln in block.splitlines() if ln.strip()]
-        if len(lines) < 2:
-            logger.debug("Skipping VTT block with insufficient lines: %r", block)
-            continue
-        # optional cue id at lines[0]; timings line contains '-->'
-        timing_idx = 0 if "-->" in lines[0] else 1
-        if "-->" not in lines[timing_idx]:
-            logger.debug("Skipping VTT block without timing: %r", block)
-            continue
-        start_s, end_s = [x.strip() for x in lines[timing_idx].split("-->")[:2]]
-        text = " ".join(lines[timing_idx + 1 :])
-        try:
-            start = _ts_to_seconds(start_s)
-            end = _ts_to_seconds(end_s)
-            segments.append(
-                {"text": text, "start": start, "duration": max(0.0, end - start)}
-            )
-        except Exception as exc:
-            logger.debug(
-                "Failed to parse VTT timing %s --> %s: %s", start_s, end_s, exc
-            )
+    block: List[str] = []
+    for line in chain(lines, ("",)):  # trailing "" flushes the last cue
+        if line.strip():
+            block.append(line.rstrip("\r\n"))
             continue
+        if block:
+            segment = _vtt_cue_to_segment("\n".join(block))
+            if segment is not None:
+                segments.append(segment)
+            block.clear()
     return segments
 
 
+def _vtt_cue_to_segment(block: str) -> Optional[Dict[str, Any]]:
+    # optional cue id before the timing line; cue text after it
+    match = _VTT_TIMING_RE.search(block)
+    if match is None:
+        logger.debug("Skipping VTT block without timing: %r", block)
+        return None
+    text = " ".join(ln.strip() for ln in block[match.end():].splitlines() if ln.strip())
+    if not text:
+        logger.debug("Skipping VTT block with insufficient lines: %r", block)
+        return None
+    sh, sm, ss, sms, eh, em, es, ems = match.groups()
+    # whole milliseconds, divided once: exact for every .mmm value
+    start_ms = int(sh or 0) * 3_600_000 + int(sm) * 60_000 + int(ss) * 1000 + int(sms)
+    end_ms = int(eh or 0) * 3_600_000 + int(em) * 60_000 + int(es) * 1000 + int(ems)
+    return {"text": text, "start": start_ms / 1000, "duration": max(0, end_ms - start_ms) / 1000}
+
+
 # ---------------------------------------------------------------------------
 # Formatting helpers
 # ---------------------------------------------------------------------------
 
 
-def _format_time(seconds: float) -> str:
-    m, s = divmod(int(seconds), 60)
-    return f"{m:02d}:{s:02d}"
+# [MM:SS] prefixes are built inline (no helper call or divmod tuple per
+# segment); transcripts routinely run to thousands of segments.
 
 
 def format_transcript(transcript: List[Dict[str, Any]]) -> str:
@@ -371,9 +431,62 @@ def format_transcript(transcript: List[Dict[str, Any]]) -> str:
     if not transcript:
         return "<no transcript available>"
 
-    return "\n".join(
-        f"[{_format_time(seg['start'])}] {seg['text']}" for seg in transcript
-    )
+    parts = [f"[{(t := int(seg['start'])) // 60:02d}:{t % 60:02d}] {seg['text']}" for seg in transcript]
+    return "\n".join(parts)
+
+
+def _segment_texts(transcript: List[Any]) -> List[str]:
+    """Text of every segment – joined, the plain text stored in the DB.
+
+    Normalises as it goes: non-dict segments (e.g. snippet objects) are read
+    through their attributes and dicts without ``text`` fall back to their repr.
+    """
+    # Fast path: `fetch_transcript` always yields {'text', 'start', ...} dicts
+    try:
+        return [seg["text"] for seg in transcript]
+    except (KeyError, TypeError):
+        pass
+
+    texts = []
+    irregular = 0
+    for seg in transcript:
+        if isinstance(seg, dict) and "text" in seg:
+            texts.append(seg["text"])
+        else:
+            texts.append(str(seg) if isinstance(seg, dict) else str(getattr(seg, "text", seg)))
+            irregular += 1
+    if irregular:
+        logger.warning("%d transcript segment(s) were not {'text', 'start'} dicts", irregular)
+    return texts
+
+
+def _timestamped_lines(transcript: List[Any], texts: List[str]) -> List[str]:
+    """[MM:SS]-prefixed file lines for *transcript*, given its `_segment_texts`."""
+    try:
+        return [
+            f"[{(t := int(seg['start'])) // 60:02d}:{t % 60:02d}] {text}"
+            for seg, text in zip(transcript, texts)
+        ]
+    except (KeyError, TypeError):
+        pass
+
+    lines = []
+    for seg, text in zip(transcript, texts):
+        if isinstance(seg, dict):
+            start = int(seg.get("start") or 0)
+        else:
+            start = int(getattr(seg, "start", None) or 0)
+        lines.append(f"[{start // 60:02d}:{start % 60:02d}] {text}")
+    return lines
+
+
+def _file_lines(transcript: List[Any], texts: List[str]) -> List[str]:
+    try:
+        return _timestamped_lines(transcript, texts)
+    except Exception as e:
+        logger.error(f"Failed to render transcript: {e}")
+        # Fall back to a file with a simple error message
+        return [f"Error processing transcript: {e}"]
 
 
 # ---------------------------------------------------------------------------
@@ -381,92 +494,151 @@ def format_transcript(transcript: List[Dict[str, Any]]) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _ensure_transcripts_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS transcripts
-        (
-            id
-            INTEGER
-            PRIMARY
-            KEY
-            AUTOINCREMENT,
-            video_id
-            TEXT
-            NOT
-            NULL,
-            video_title
-            TEXT,
-            channel_name
-            TEXT,
-            transcript_text
-            TEXT
-            NOT
-            NULL,
-            transcript_language
-            TEXT,
-            extraction_date
-            TIMESTAMP
-            NOT
-            NULL
-        );
-        """
-    )
-    conn.commit()
+# Statement texts are module constants so every call reuses the same entry
+# in the connection's prepared-statement cache.
+_SQL_EXISTS = "SELECT 1 FROM transcripts WHERE video_id = ? LIMIT 1"
+_SQL_STORED = "SELECT video_id, video_title, transcript_sha256 FROM transcripts WHERE video_id IN ({marks})"
+
+# Inserts new videos; for existing ones the trailing `WHERE ?` turns the
+# update into a no-op unless overwrite is set. SQLite stamps extraction_date
+# itself (UTC, ISO 8601 like datetime.isoformat(), to the millisecond).
+_SQL_UPSERT = """
+    INSERT INTO transcripts (video_id, video_title, channel_name, transcript_text,
+                             transcript_language, extraction_date, transcript_sha256,
+                             transcript_compressed)
+    VALUES (?, ?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now'), ?, ?)
+    ON CONFLICT(video_id) DO UPDATE SET
+        video_title = excluded.video_title,
+        channel_name = excluded.channel_name,
+        transcript_text = excluded.transcript_text,
+        transcript_language = excluded.transcript_language,
+        extraction_date = excluded.extraction_date,
+        transcript_sha256 = excluded.transcript_sha256,
+        transcript_compressed = excluded.transcript_compressed
+    WHERE ?
+"""
+
+
+# Long ingest runs: besides SQLite's passive auto-checkpoints, fully fold
+# the WAL back into the database and truncate it every N saves.
+_CHECKPOINT_EVERY = 500
+_saves_since_checkpoint = 0
+
+
+def _checkpoint_periodically(conn: sqlite3.Connection, saves: int = 1) -> None:
+    global _saves_since_checkpoint  # noqa: PLW0603
+    _saves_since_checkpoint += saves
+    if _saves_since_checkpoint >= _CHECKPOINT_EVERY:
+        _saves_since_checkpoint = 0
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+
+
+def _transcript_exists(conn: sqlite3.Connection, video_id: str) -> bool:
+    return conn.execute(_SQL_EXISTS, (video_id,)).fetchone() is not None
+
 
-    # Check if transcript_language column exists, add it if not
+# File-name sanitising for transcript titles
+_UNSAFE_CHARS = _re.compile(r"[^\w\s-]")
+# The ASCII characters _UNSAFE_CHARS removes, for a C-level bytes.translate
+_UNSAFE_ASCII = bytes(c for c in range(128) if _UNSAFE_CHARS.match(chr(c)))
+
+
+def _transcript_path(video_id: str, video_title: str) -> Path:
+    safe_id = video_id.replace("/", "_").replace("\\", "_")
+    if video_title.isascii():
+        stripped = video_title.encode("ascii").translate(None, _UNSAFE_ASCII).decode("ascii")
+    else:  # \w keeps non-ASCII letters, which a fixed table can't express
+        stripped = _UNSAFE_CHARS.sub("", video_title)
+    # Only plain spaces become "_": existing files were named this way, and
+    # stored_transcript_path must keep finding them.
+    safe_title = stripped.replace(" ", "_")[:60]
+    return settings.transcripts_dir / f"transcript_{safe_id}_{safe_title}.txt"
+
+
+def stored_transcript_path(video_id: str) -> Optional[Path]:
+    """Text file of an already saved transcript, or None if it must be fetched.
+
+    Transcripts don't change once published, so the DB row plus its file
+    serve as the cache: callers check here before going to the network.
+    """
     try:
-        conn.execute("SELECT transcript_language FROM transcripts LIMIT 1")
-    except sqlite3.OperationalError:
-        conn.execute("ALTER TABLE transcripts ADD COLUMN transcript_language TEXT;")
-        conn.commit()
+        from .db import init_schema
+    except ImportError:  # running as a script, not a module
+        from src.db import init_schema
 
+    conn = _get_conn()
+    init_schema(conn)
+    row = conn.execute(_SQL_STORED.format(marks="?"), (video_id,)).fetchone()
+    if row is None:
+        return None
+    path = _transcript_path(video_id, row[1] or f"Unknown Title – {video_id}")
+    return path if path.exists() else None
 
-def _transcript_exists(conn: sqlite3.Connection, video_id: str) -> bool:
-    cur = conn.execute(
-        "SELECT 1 FROM transcripts WHERE video_id = ? LIMIT 1", (video_id,)
-    )
-    return cur.fetchone() is not None
 
+class PreparedTranscript(NamedTuple):
+    """Normalised transcript ready for the DB, plus the path of its text file."""
 
-def save_transcript(
+    file_path: Path
+    video_id: str
+    video_title: str
+    channel_name: str
+    transcript_text: str
+
+
+def write_transcript_file(
     transcript: List[Dict[str, Any]],
     video_id: str,
     video_title: Optional[str] = None,
     channel_name: Optional[str] = None,
-    transcript_language: Optional[str] = None,
-    overwrite: bool = False,
-) -> Tuple[Path, bool]:
+) -> PreparedTranscript:
     """
-    Persist transcript to a nicely-named text file **and** SQLite.
+    Normalise *transcript*, write the nicely-named text file and return the
+    fields needed for the DB row (no DB access).
+    """
+    prepared, file_lines = _prepare_transcript(transcript, video_id, video_title, channel_name)
+    _write_text(prepared.file_path, file_lines())
+    return prepared
 
-    Parameters
-    ----------
-    transcript : List[Dict[str, Any]]
-        Transcript segments.
-    video_id : str
-        11-character YouTube ID.
-    video_title : Optional[str]
-        Video title (auto-fetched if None).
-    channel_name : Optional[str]
-        Channel name (auto-fetched if None).
-    transcript_language : Optional[str]
-        Language of the transcript (should be provided by fetch_transcript).
-    overwrite : bool
-        Whether to overwrite existing transcripts.
 
-    Returns
-    -------
-    (Path, bool)
-        Path to file and a flag indicating whether a DB insert occurred.
+_WRITE_BUFFER = 1 << 20
+_WRITE_LINES = 4096  # timestamped lines encoded per write()
+
+
+def _write_text(out_file: Path, lines: List[str]) -> None:
+    # Streams the lines into a 1 MiB binary buffer a block at a time: the
+    # whole file never exists as one str (or one bytes copy), so peak memory
+    # stays flat however long the video, and there is no text-layer codec.
+    with open(out_file, "wb", buffering=_WRITE_BUFFER) as fh:
+        for start in range(0, len(lines), _WRITE_LINES):
+            if start:
+                fh.write(b"\n")
+            fh.write("\n".join(lines[start:start + _WRITE_LINES]).encode("utf-8"))
+    logger.info("Transcript written to %s", out_file)
+
+
+@lru_cache(maxsize=4096)
+def _pytube_metadata(video_id: str) -> Tuple[Optional[str], Optional[str]]:
+    """Last-resort, uncached pytube look-up; memoised so re-saves don't repeat it.
+
+    (`get_video_metadata` keeps its own SQLite + in-process caches.)
     """
+    return get_video_metadata_pytube(video_id)
+
+
+def _prepare_transcript(
+    transcript: List[Dict[str, Any]],
+    video_id: str,
+    video_title: Optional[str],
+    channel_name: Optional[str],
+) -> Tuple[PreparedTranscript, Callable[[], List[str]]]:
+    """`write_transcript_file` minus the write: also returns a builder of the file's lines."""
     ensure_dirs_exist()
 
     # Auto-fetch metadata if caller didn't supply
     if not (video_title and channel_name):
         auto_title, auto_channel = get_video_metadata(video_id)
         if not auto_title or not auto_channel:
-            auto_title, auto_channel = get_video_metadata_pytube(video_id)
+            auto_title, auto_channel = _pytube_metadata(video_id)
         video_title = video_title or auto_title or f"Unknown Title – {video_id}"
         channel_name = channel_name or auto_channel or "Unknown Channel"
 
@@ -490,86 +662,200 @@ def save_transcript(
             {"text": "[No transcript content available]", "start": 0.0, "duration": 0.0}
         ]
 
-    # Ensure all transcript items are dictionaries with the required keys
-    for i, item in enumerate(transcript):
-        if not isinstance(item, dict):
-            logger.warning(f"Transcript item {i} is not a dict: {item}")
-            try:
-                # Try to convert to dict if it has the necessary attributes
-                transcript[i] = {
-                    "text": str(getattr(item, "text", str(item))),
-                    "start": float(getattr(item, "start", 0.0)),
-                    "duration": float(getattr(item, "duration", 0.0)),
-                }
-            except Exception as e:
-                logger.error(f"Failed to convert transcript item to dict: {e}")
-                transcript[i] = {"text": str(item), "start": 0.0, "duration": 0.0}
-        elif "text" not in item:
-            logger.warning(f"Transcript item {i} missing 'text' key: {item}")
-            transcript[i]["text"] = str(item)
-
     # ---------- write text file ------------------------------------------------
-    safe_id = video_id.replace("/", "_").replace("\\", "_")
-    safe_title = _re.sub(r"[^\w\s-]", "", video_title).replace(" ", "_")[:60]
-    out_file = settings.transcripts_dir / f"transcript_{safe_id}_{safe_title}.txt"
+    out_file = _transcript_path(video_id, video_title)
 
+    # The DB text is built here; the file lines only when the caller asks
+    # (unchanged re-saves skip them). A formatting failure affects the file only.
     try:
-        out_file.write_text(format_transcript(transcript), encoding="utf-8")
-        logger.info("Transcript written to %s", out_file)
+        texts = _segment_texts(transcript)
     except Exception as e:
-        logger.error(f"Failed to write transcript to file: {e}")
-        # Create a fallback file with a simple error message
-        error_text = f"Error processing transcript: {e}"
-        out_file.write_text(error_text, encoding="utf-8")
+        logger.error(f"Failed to extract transcript text: {e}")
+        # Same fallback file as a formatting failure, not an empty one
+        error_lines = [f"Error processing transcript: {e}"]
+        prepared = PreparedTranscript(
+            out_file, video_id, video_title, channel_name, "[Error extracting transcript text]"
+        )
+        return prepared, error_lines.copy
 
-    # ---------- upsert into DB -------------------------------------------------
-    saved = False
-    with _connect(settings.db_path) as conn:
-        _ensure_transcripts_table(conn)
-        if _transcript_exists(conn, video_id):
-            if overwrite:
-                logger.info("Overwriting existing DB transcript for %s", video_id)
-                conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+    prepared = PreparedTranscript(out_file, video_id, video_title, channel_name, "\n".join(texts))
+    return prepared, partial(_file_lines, transcript, texts)
+
+
+# Writes the .txt file while the DB upsert runs on the caller's thread.
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="transcript-io")
+
+# Bulk saves of at least this many files go through one io_uring submission
+# (Linux + liburing); each file is then encoded whole, so batches are capped.
+_URING_MIN_FILES = 8
+_URING_BATCH = 64
+
+
+def _write_texts_uring(files: List[Tuple[Path, List[str]]]) -> None:
+    with UringResultWriter(max_batch=_URING_BATCH) as writer:
+        for out_file, lines in files:
+            writer.submit_write(out_file, "\n".join(lines).encode("utf-8"))
+    for out_file, _ in files:
+        logger.info("Transcript written to %s", out_file)
+
+
+def _stored_rows(
+    conn: sqlite3.Connection, video_ids: List[str]
+) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """video_id → (title, transcript_sha256) for those of *video_ids* in the DB."""
+    stored = {}
+    for start in range(0, len(video_ids), 500):
+        chunk = video_ids[start:start + 500]
+        marks = ",".join("?" * len(chunk))
+        for video_id, title, digest in conn.execute(_SQL_STORED.format(marks=marks), chunk):
+            stored[video_id] = (title, digest)
+    return stored
+
+
+def save_transcript(
+    transcript: List[Dict[str, Any]],
+    video_id: str,
+    video_title: Optional[str] = None,
+    channel_name: Optional[str] = None,
+    transcript_language: Optional[str] = None,
+    overwrite: bool = False,
+) -> Tuple[Path, bool]:
+    """
+    Persist transcript to a nicely-named text file **and** SQLite.
+
+    Parameters
+    ----------
+    transcript : List[Dict[str, Any]]
+        Transcript segments.
+    video_id : str
+        11-character YouTube ID.
+    video_title : Optional[str]
+        Video title (auto-fetched if None).
+    channel_name : Optional[str]
+        Channel name (auto-fetched if None).
+    transcript_language : Optional[str]
+        Language of the transcript (should be provided by fetch_transcript).
+    overwrite : bool
+        Whether to overwrite existing transcripts.
+
+    Returns
+    -------
+    (Path, bool)
+        Path to file and a flag indicating whether a DB insert occurred.
+    """
+    return save_transcripts_bulk(
+        [(transcript, video_id, video_title, channel_name, transcript_language)],
+        overwrite=overwrite,
+    )[0]
+
+
+def save_transcripts_bulk(
+    items: Iterable[
+        Tuple[List[Dict[str, Any]], str, Optional[str], Optional[str], Optional[str]]
+    ],
+    overwrite: bool = False,
+) -> List[Tuple[Path, bool]]:
+    """
+    `save_transcript` for many videos: one write lock and one commit for all.
+
+    *items* are ``(transcript, video_id, video_title, channel_name,
+    transcript_language)`` tuples; returns ``(path, saved)`` per item, in order.
+    """
+    items = list(items)
+    results: List[Optional[Tuple[Path, bool]]] = [None] * len(items)
+
+    # Imported here: src.db re-exports this module's helpers.
+    try:
+        from .db import init_schema, pack_transcript_text
+    except ImportError:  # running as a script, not a module
+        from src.db import init_schema, pack_transcript_text
+
+    conn = _get_conn()
+    init_schema(conn)
+
+    # Read outside the write lock: only decides what to skip, render and
+    # write; the saved flags are settled inside the transaction below.
+    stored = _stored_rows(conn, [item[1] for item in items])
+
+    # Without overwrite, videos already in the DB (whose text file is still
+    # on disk) return straight away: no metadata look-up, render or write.
+    if not overwrite:
+        for idx, (_, video_id, *_rest) in enumerate(items):
+            if video_id in stored:
+                path = _transcript_path(video_id, stored[video_id][0] or f"Unknown Title – {video_id}")
+                if path.exists():
+                    logger.info("Transcript for %s already in DB; skipping insert.", video_id)
+                    results[idx] = (path, False)
+    todo = [idx for idx, done in enumerate(results) if done is None]
+
+    # Titles/channels for every video lacking them in one metadata round
+    # (the per-video look-ups in _prepare_transcript then hit the memo).
+    need_meta = [items[idx][1] for idx in todo if not (items[idx][2] and items[idx][3])]
+    if len(need_meta) > 1:
+        get_video_metadata_many(need_meta)
+
+    prepared_rows = []
+    writes = []
+    uring_files: List[Tuple[Path, List[str]]] = []
+    use_uring = len(todo) >= _URING_MIN_FILES and uring_available()
+    for idx in todo:
+        transcript, video_id, video_title, channel_name, language = items[idx]
+        prepared, file_lines = _prepare_transcript(transcript, video_id, video_title, channel_name)
+        digest = hashlib.sha256(prepared.transcript_text.encode("utf-8")).hexdigest()
+        # Re-extractions with unchanged text and title leave the file alone
+        # (and never build its timestamped lines)
+        if stored.get(video_id) != (prepared.video_title, digest) or not prepared.file_path.exists():
+            if use_uring:
+                uring_files.append((prepared.file_path, file_lines()))
             else:
-                logger.info(
-                    "Transcript for %s already in DB; skipping insert.", video_id
-                )
-                return out_file, False
+                writes.append(_IO_POOL.submit(_write_text, prepared.file_path, file_lines()))
+        prepared_rows.append((idx, prepared, language, digest))
+    if uring_files:
+        writes.append(_IO_POOL.submit(_write_texts_uring, uring_files))
 
-        # Extract transcript text safely
-        try:
-            transcript_text = "\n".join(
-                segment.get("text", "") for segment in transcript
+    # ---------- upsert into DB -------------------------------------------------
+    # One executemany of _SQL_UPSERT (inserts, or with overwrite updates)
+    # inside a single BEGIN IMMEDIATE … COMMIT. A row is written always with
+    # overwrite, otherwise only for videos not stored (nor earlier in this
+    # batch) – checked under the write lock, so concurrent writers can't
+    # make the flags stale.
+    saved_flags = []
+    rows = []
+    for _, prepared, language, digest in prepared_rows:
+        stored_text, compressed = pack_transcript_text(prepared.transcript_text)
+        rows.append((
+            prepared.video_id,
+            prepared.video_title,
+            prepared.channel_name,
+            stored_text,
+            language,
+            digest,
+            compressed,
+            1 if overwrite else 0,
+        ))
+    if rows:
+        with conn:  # commit, or roll back so the shared connection stays usable
+            conn.execute("BEGIN IMMEDIATE")
+            seen = set() if overwrite else set(_stored_rows(conn, [row[0] for row in rows]))
+            for row in rows:
+                saved_flags.append(overwrite or row[0] not in seen)
+                seen.add(row[0])
+            conn.executemany(_SQL_UPSERT, rows)
+        for written in writes:
+            written.result()  # surface write errors; the files are on disk on return
+        _checkpoint_periodically(conn, len(prepared_rows))
+
+    for (idx, prepared, language, _), saved in zip(prepared_rows, saved_flags):
+        if saved:
+            logger.info(
+                "Transcript stored in DB (video_id=%s, language=%s)",
+                prepared.video_id,
+                language,
             )
-        except Exception as e:
-            logger.error(f"Error extracting transcript text: {e}")
-            transcript_text = "[Error extracting transcript text]"
-
-        # Update SQL query to include transcript_language
-        conn.execute(
-            """
-            INSERT INTO transcripts (video_id, video_title, channel_name,
-                                     transcript_text, transcript_language, extraction_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                video_id,
-                video_title,
-                channel_name,
-                transcript_text,
-                transcript_language,
-                datetime.utcnow().isoformat(),
-            ),
-        )
-        conn.commit()
-        saved = True
-        logger.info(
-            "Transcript stored in DB (video_id=%s, language=%s)",
-            video_id,
-            transcript_language,
-        )
-
-    return out_file, saved
+        else:
+            logger.info("Transcript for %s already in DB; skipping insert.", prepared.video_id)
+        results[idx] = (prepared.file_path, saved)
+    return results  # type: ignore[return-value]
 
 
 # ---------------------------------------------------------------------------
@@ -597,7 +883,14 @@ def _interactive_flow() -> None:
         return
 
     # Preview first ~500 characters
-    preview = "\n".join(seg["text"] for seg in transcript)[:500]
+    # Only as many segments as the 500 characters need, not the whole text
+    head, size = [], 0
+    for seg in transcript:
+        head.append(seg["text"])
+        size += len(seg["text"]) + 1
+        if size > 500:
+            break
+    preview = "\n".join(head)[:500]
     print("\nTranscript preview:\n", preview, "…\n", sep="")
 
     # Optional metadata overrides
@@ -619,4 +912,8 @@ def _interactive_flow() -> None:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
     _interactive_flow()
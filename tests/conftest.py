@@ -0,0 +1,39 @@
+"""Shared test setup: stub heavy/optional dependencies before imports."""
+
+import sys
+import types
+from pathlib import Path
+
+# Stub external dependency to avoid requiring actual package during tests
+yt_api = types.ModuleType("youtube_transcript_api")
+yt_api.YouTubeTranscriptApi = object
+sys.modules["youtube_transcript_api"] = yt_api
+errors_mod = types.ModuleType("youtube_transcript_api._errors")
+for name in ["TranscriptsDisabled", "VideoUnavailable", "NoTranscriptFound"]:
+    setattr(errors_mod, name, type(name, (Exception,), {}))
+sys.modules["youtube_transcript_api._errors"] = errors_mod
+
+# Stub minimal config module to satisfy youtube_transcript imports
+config_stub = types.ModuleType("config")
+
+
+class DummySettings:
+    youtube_languages = ["en"]
+    youtube_cookies_path = None
+    https_proxy = None
+    transcripts_dir = Path("./")
+    results_dir = Path("./")
+    db_path = Path("./dummy.db")
+
+
+def ensure_dirs_exist() -> None:  # pragma: no cover - no-op for tests
+    pass
+
+
+config_stub.settings = DummySettings()
+config_stub.ensure_dirs_exist = ensure_dirs_exist
+sys.modules["config"] = config_stub
+
+# Ensure repository root and src directory are on the path
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.extend([str(BASE_DIR / "src"), str(BASE_DIR)])
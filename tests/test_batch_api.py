@@ -0,0 +1,152 @@
+import json
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from src import gpt
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    settings = gpt.settings
+    for name, value in {
+        "openai_api_key": "test",
+        "openai_model": "test-model",
+        "openai_concurrency": 4,
+        "openai_rpm": 0,
+        "openai_tpm": 0,
+        "db_path": tmp_path / "a.db",
+        "compress_transcripts": False,
+    }.items():
+        monkeypatch.setattr(settings, name, value, raising=False)
+    return gpt.TranscriptAnalyzer()
+
+
+def _transcript(analyzer, video_id, text="some text"):
+    return analyzer.upsert_and_fetch(
+        video_id,
+        video_title=f"Title {video_id}",
+        channel_name="C",
+        transcript_text=text,
+        transcript_language="en",
+    )
+
+
+def _body(answer, text=None):
+    text = text or json.dumps({"answer": answer, "reasoning": "r", "evidence": ["e"]})
+    return {
+        "model": "test-model",
+        "usage": {"total_tokens": 11},
+        "output": [
+            {"type": "reasoning", "content": []},
+            {
+                "type": "message",
+                "content": [
+                    {"type": "output_text", "text": text[:5]},
+                    {"type": "refusal", "refusal": "ignored"},
+                    {"type": "output_text", "text": text[5:]},
+                ],
+            },
+        ],
+    }
+
+
+def _line(custom_id, body=None, status=200, error=None):
+    return json.dumps(
+        {
+            "custom_id": str(custom_id),
+            "response": {"status_code": status, "body": body or {}},
+            "error": error,
+        }
+    )
+
+
+def _batch(lines, status="completed"):
+    return SimpleNamespace(
+        id="batch_1",
+        status=status,
+        output_file_id="file_out",
+        completed_at=0,
+        lines=lines,
+    )
+
+
+def _fake_client(analyzer, batch):
+    analyzer.__dict__["client"] = SimpleNamespace(
+        batches=SimpleNamespace(retrieve=lambda _id: batch),
+        files=SimpleNamespace(
+            content=lambda _id: SimpleNamespace(iter_lines=lambda: iter(batch.lines))
+        ),
+    )
+
+
+def test_response_output_text_joins_message_text_parts():
+    assert gpt._response_output_text(_body("No", "abcdefgh")) == "abcdefgh"
+    assert gpt._response_output_text({}) == ""
+
+
+def test_build_batch_request_keys_by_transcript_id(analyzer):
+    rec = _transcript(analyzer, "vid00000001", "hello world")
+    row = analyzer.get_transcript_by_id(rec["id"])
+    assert "transcript_text" not in row.keys()  # text is loaded only for the prompt
+    request = analyzer.build_batch_request(row)
+
+    assert request["custom_id"] == str(rec["id"])
+    assert request["url"] == "/v1/responses"
+    body = request["body"]
+    assert body["model"] == "test-model"
+    assert [m["role"] for m in body["input"]] == ["system", "user"]
+    assert body["input"][0]["content"] == analyzer.system_prompt
+    assert "hello world" in body["input"][1]["content"]
+    json.dumps(request)  # must serialise to a JSONL line
+
+
+def test_ingest_stores_successes_and_skips_failures(analyzer):
+    ok = _transcript(analyzer, "vid00000001")
+    failed = _transcript(analyzer, "vid00000002")
+    bad_json = _transcript(analyzer, "vid00000003")
+    batch = _batch(
+        [
+            _line(ok["id"], _body("Yes")),
+            "",
+            _line(failed["id"], status=500, error={"message": "boom"}),
+            _line(bad_json["id"], _body("No", "not json")),
+            _line(9999, _body("No")),  # unknown transcript
+        ]
+    )
+    _fake_client(analyzer, batch)
+
+    results = analyzer.ingest_batch_results(batch)
+
+    assert [(vid, v.answer) for vid, v in results] == [("vid00000001", "Yes")]
+    verdict = results[0][1]
+    assert verdict.video_title == "Title vid00000001"
+    assert verdict.tokens_used == 11
+    assert verdict.evidence == ["e"]
+    conn = sqlite3.connect(analyzer.db_path)
+    rows = conn.execute("SELECT transcript_id, answer FROM analysis_results").fetchall()
+    conn.close()
+    assert rows == [(ok["id"], "Yes")]
+
+
+def test_ingest_rejects_unfinished_batch(analyzer):
+    with pytest.raises(RuntimeError):
+        analyzer.ingest_batch_results(_batch([], status="expired"))
+
+
+def test_poll_and_ingest_marks_recorded_batch_finished(analyzer):
+    rec = _transcript(analyzer, "vid00000001")
+    with analyzer._write_conn() as conn:
+        conn.execute(
+            analyzer._SQL_BATCH_SUBMITTED,
+            ("batch_1", "file_in", 1, "in_progress", "now"),
+        )
+        conn.commit()
+    assert analyzer.unfinished_batches() == ["batch_1"]
+
+    _fake_client(analyzer, _batch([_line(rec["id"], _body("No"))]))
+    results = analyzer.poll_and_ingest("batch_1")
+
+    assert [vid for vid, _ in results] == ["vid00000001"]
+    assert analyzer.unfinished_batches() == []
@@ -0,0 +1,24 @@
+import pytest
+
+from youtube_transcript import extract_video_id
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42",
+        "https://youtu.be/dQw4w9WgXcQ?si=abc",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    ],
+)
+def test_extract_video_id_supported_forms(url):
+    assert extract_video_id(url) == "dQw4w9WgXcQ"
+
+
+def test_extract_video_id_rejects_unsupported_url():
+    with pytest.raises(ValueError):
+        extract_video_id("https://www.youtube.com/channel/UCabc")
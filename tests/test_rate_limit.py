@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+from rate_limit import RateLimiter
+
+
+def test_rate_limiter_waits_for_request_capacity():
+    limiter = RateLimiter(
+        max_requests_per_minute=600, max_tokens_per_minute=0
+    )  # 10 req/s
+
+    async def run():
+        for _ in range(602):
+            await limiter.acquire()
+
+    start = time.monotonic()
+    asyncio.run(run())
+    # The first 600 fit the full bucket; the last two wait ~0.1s each.
+    assert 0.15 <= time.monotonic() - start < 1.0
+
+
+def test_rate_limiter_reserves_estimated_tokens():
+    limiter = RateLimiter(max_requests_per_minute=0, max_tokens_per_minute=6000)
+
+    asyncio.run(limiter.acquire(estimated_tokens=5000))
+    assert limiter.available_token_capacity < 1001
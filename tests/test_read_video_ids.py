@@ -0,0 +1,14 @@
+from genocide_detect import _read_video_ids
+
+
+def test_read_video_ids_drops_repeats(tmp_path):
+    source = tmp_path / "urls.txt"
+    source.write_text(
+        "# comment\n"
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ\n"
+        "\n"
+        "https://youtu.be/aaaaaaaaaaa\n"
+        "dQw4w9WgXcQ\n",
+        encoding="utf-8",
+    )
+    assert _read_video_ids(source) == ["dQw4w9WgXcQ", "aaaaaaaaaaa"]
@@ -0,0 +1,163 @@
+import re
+import sqlite3
+
+import pytest
+
+from src import youtube_transcript as yt
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Point the transcript store at a fresh temp DB + directory."""
+    settings = yt.settings
+    monkeypatch.setattr(settings, "db_path", tmp_path / "t.db", raising=False)
+    monkeypatch.setattr(settings, "transcripts_dir", tmp_path, raising=False)
+    monkeypatch.setattr(settings, "compress_transcripts", False, raising=False)
+    monkeypatch.setattr(yt._local, "conn", None, raising=False)
+    yield tmp_path
+    if yt._local.conn is not None:
+        yt._local.conn.close()
+
+
+def _rows(store):
+    conn = sqlite3.connect(store / "t.db")
+    try:
+        return conn.execute(
+            "SELECT video_id, transcript_text FROM transcripts ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_segment_without_start_keeps_db_text(store):
+    segments = [{"text": "hello"}, {"text": "world", "start": 65}]
+    path, saved = yt.save_transcript(segments, "vid00000001", "Title", "Chan", "en")
+
+    assert saved
+    assert _rows(store) == [("vid00000001", "hello\nworld")]
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "[00:00] hello",
+        "[01:05] world",
+    ]
+
+
+def test_unchanged_resave_skips_rendering(store, monkeypatch):
+    segments = [{"text": "hello", "start": 1.0}]
+    path, _ = yt.save_transcript(segments, "vid00000002", "Title", "Chan", "en")
+
+    def boom(*_args):
+        raise AssertionError("file lines rendered for an unchanged transcript")
+
+    monkeypatch.setattr(yt, "_timestamped_lines", boom)
+    assert yt.save_transcript(
+        segments, "vid00000002", "Title", "Chan", "en", overwrite=True
+    ) == (path, True)
+    assert path.read_text(encoding="utf-8") == "[00:01] hello"
+
+
+def _item(video_id, text="hello", title="Title"):
+    return ([{"text": text, "start": 0.0}], video_id, title, "Chan", "en")
+
+
+def test_insert_skip_and_overwrite_flags(store):
+    path, saved = yt.save_transcripts_bulk([_item("vid00000003")])[0]
+    assert saved and path.exists()
+
+    assert yt.save_transcripts_bulk([_item("vid00000003", "changed")]) == [
+        (path, False)
+    ]
+    assert _rows(store) == [("vid00000003", "hello")]
+
+    assert yt.save_transcripts_bulk(
+        [_item("vid00000003", "changed")], overwrite=True
+    ) == [(path, True)]
+    assert _rows(store) == [("vid00000003", "changed")]
+
+
+def test_duplicate_ids_in_one_batch(store):
+    results = yt.save_transcripts_bulk(
+        [_item("vid00000004", "first"), _item("vid00000004", "second")]
+    )
+
+    assert [saved for _, saved in results] == [True, False]
+    assert _rows(store) == [("vid00000004", "first")]
+
+
+def test_missing_text_file_is_rewritten(store):
+    path, _ = yt.save_transcript(*_item("vid00000005"))
+    path.unlink()
+
+    assert yt.save_transcript(*_item("vid00000005")) == (path, False)
+    assert path.read_text(encoding="utf-8") == "[00:00] hello"
+
+
+def test_saved_flag_checked_under_write_lock(store, monkeypatch):
+    # Another writer stores the video between the pre-read and the upsert
+    prepare = yt._prepare_transcript
+
+    def racing_prepare(*args):
+        other = sqlite3.connect(store / "t.db")
+        with other:
+            other.execute(
+                "INSERT INTO transcripts (video_id, transcript_text, extraction_date) "
+                "VALUES ('vid00000006', 'theirs', 'now')"
+            )
+        other.close()
+        return prepare(*args)
+
+    monkeypatch.setattr(yt, "_prepare_transcript", racing_prepare)
+    assert yt.save_transcript(*_item("vid00000006"))[1] is False
+    assert _rows(store) == [("vid00000006", "theirs")]
+
+
+def test_compressed_text_round_trip(store, monkeypatch):
+    from src import db
+
+    monkeypatch.setattr(db, "zstandard", None)  # exercise the zlib fallback
+    monkeypatch.setattr(yt.settings, "compress_transcripts", True)
+    text = "line one\nline two – ünïcode"
+    yt.save_transcript(
+        [{"text": t, "start": 0} for t in text.split("\n")], "vid00000007", "T", "C"
+    )
+
+    conn = sqlite3.connect(store / "t.db")
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM transcripts").fetchone()
+    conn.close()
+    assert row["transcript_text"] == "" and row["transcript_compressed"][:1] == b"\x78"
+    assert db.row_transcript_text(row) == text
+
+
+def test_bulk_save_through_uring_writer(store, monkeypatch):
+    monkeypatch.setattr(yt, "uring_available", lambda: True)
+    items = [
+        _item(f"vid0000010{i}", f"text {i}", f"T{i}")
+        for i in range(yt._URING_MIN_FILES)
+    ]
+    results = yt.save_transcripts_bulk(items)
+
+    assert all(saved for _, saved in results)
+    for i, (path, _) in enumerate(results):
+        assert path.read_text(encoding="utf-8") == f"[00:00] text {i}"
+    assert not list(store.glob("*.tmp"))
+
+
+def test_text_extraction_failure_writes_error_file(store, monkeypatch):
+    def broken(_transcript):
+        raise ValueError("bad segments")
+
+    monkeypatch.setattr(yt, "_segment_texts", broken)
+    path, _ = yt.save_transcript(*_item("vid00000008"))
+
+    assert (
+        path.read_text(encoding="utf-8") == "Error processing transcript: bad segments"
+    )
+    assert _rows(store) == [("vid00000008", "[Error extracting transcript text]")]
+
+
+def test_file_name_keeps_legacy_sanitising(store):
+    title = "Is it  genocide?\tA talk – ünïcode!"
+    path = yt._transcript_path("vid00000009", title)
+
+    legacy = re.sub(r"[^\w\s-]", "", title).replace(" ", "_")[:60]
+    assert path == store / f"transcript_vid00000009_{legacy}.txt"
@@ -0,0 +1,43 @@
+import sqlite3
+
+from src.db import init_schema
+
+
+def _plan(conn, sql, params):
+    return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def test_video_lookups_use_indexes():
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+
+    plan = _plan(conn, "SELECT * FROM transcripts WHERE video_id = ?", ("x",))
+    assert "ux_transcripts_video_id" in plan
+
+    plan = _plan(
+        conn,
+        "SELECT ar.answer FROM transcripts t JOIN analysis_results ar ON ar.transcript_id = t.id "
+        "WHERE t.video_id = ? ORDER BY ar.analysis_date DESC LIMIT 1",
+        ("x",),
+    )
+    assert "SCAN" not in plan
+    assert "idx_ar_tid_date" in plan
+
+
+def test_init_schema_records_version(tmp_path):
+    from src import db
+
+    path = tmp_path / "v.db"
+    conn = sqlite3.connect(path)
+    db.init_schema(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == db._SCHEMA_VERSION
+
+    # A fresh process (empty per-process cache) skips the migration entirely
+    db._SCHEMA_READY.clear()
+    conn.execute("DROP INDEX idx_transcripts_date")
+    db.init_schema(conn)
+    names = {
+        r[0]
+        for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert "idx_transcripts_date" not in names
@@ -0,0 +1,30 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src import youtube_transcript as yt
+
+
+def test_transcript_api_built_once_under_concurrent_fetches(monkeypatch):
+    builds = []
+
+    class SlowApi:
+        def __init__(self, proxy_config=None, http_client=None):
+            time.sleep(0.01)  # widen the check-then-set window
+            builds.append(http_client)
+
+    monkeypatch.setattr(yt, "YouTubeTranscriptApi", SlowApi)
+    monkeypatch.setattr(yt, "_api", None)
+    monkeypatch.setattr(yt, "_session", None)
+    start = threading.Barrier(16)
+
+    def get(_):
+        start.wait()
+        return yt._get_api()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        apis = list(pool.map(get, range(16)))
+
+    assert len(builds) == 1
+    assert all(api is apis[0] for api in apis)
+    assert builds[0] is yt._get_session()
@@ -0,0 +1,42 @@
+from src import gpt
+
+
+class _CharTokens:
+    """Fake encoding: *per_char* tokens per character."""
+
+    def __init__(self, per_char):
+        self.per_char = per_char
+
+    def encode(self, text, disallowed_special=()):
+        return [ord(c) for c in text for _ in range(self.per_char)]
+
+    def decode(self, tokens):
+        return "".join(map(chr, tokens[:: self.per_char]))
+
+
+def test_multi_token_characters_are_truncated(monkeypatch):
+    monkeypatch.setattr(gpt, "_encoding_for", lambda _model: _CharTokens(2))
+    text = "字" * (gpt._MAX_TRANSCRIPT_TOKENS // 2 + 10)  # fewer chars than the budget
+
+    out = gpt._truncate_transcript(text, "m")
+
+    assert out.endswith("… [truncated]")
+    assert out[: -len("… [truncated]")] == "字" * (gpt._MAX_TRANSCRIPT_TOKENS // 2)
+
+
+def test_short_text_skips_encoding(monkeypatch):
+    class Boom:
+        def encode(self, *_args, **_kwargs):
+            raise AssertionError("encoded a text that fits by byte count")
+
+    monkeypatch.setattr(gpt, "_encoding_for", lambda _model: Boom())
+    assert gpt._truncate_transcript("short text", "m") == "short text"
+
+
+def test_fallback_without_tiktoken_cuts_characters(monkeypatch):
+    monkeypatch.setattr(gpt, "_encoding_for", lambda _model: None)
+    text = "a" * (gpt._MAX_TRANSCRIPT_CHARS + 1)
+
+    assert gpt._truncate_transcript(text, "m") == "a" * gpt._MAX_TRANSCRIPT_CHARS + (
+        "… [truncated]"
+    )
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from src import gpt
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    settings = gpt.settings
+    for name, value in {
+        "openai_api_key": "test",
+        "openai_model": "test-model",
+        "openai_concurrency": 4,
+        "openai_rpm": 0,
+        "openai_tpm": 0,
+        "db_path": tmp_path / "a.db",
+        "compress_transcripts": False,
+    }.items():
+        monkeypatch.setattr(settings, name, value, raising=False)
+
+    analyzer = gpt.TranscriptAnalyzer()
+    calls = []
+
+    async def fake_response(system_prompt, user_content):
+        calls.append(user_content)
+        await asyncio.sleep(0.01)  # let the other analyses overlap
+        return SimpleNamespace(
+            output_text=json.dumps({"answer": "No", "reasoning": "r", "evidence": []}),
+            model="test-model",
+            usage=SimpleNamespace(total_tokens=7),
+        )
+
+    monkeypatch.setattr(analyzer, "_create_response", fake_response)
+    analyzer.calls = calls
+    return analyzer
+
+
+def _result_rows(analyzer):
+    conn = sqlite3.connect(analyzer.db_path)
+    try:
+        return conn.execute(
+            "SELECT transcript_id, tokens_used FROM analysis_results ORDER BY transcript_id"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _transcript(analyzer, video_id, text):
+    return analyzer.upsert_and_fetch(
+        video_id,
+        video_title="T",
+        channel_name="C",
+        transcript_text=text,
+        transcript_language="en",
+    )
+
+
+def test_one_row_per_verdict_under_concurrent_analyze(analyzer):
+    recs = [_transcript(analyzer, f"vid0000000{i}", f"text {i}") for i in range(6)]
+
+    async def run():
+        await asyncio.gather(
+            *(analyzer.analyze(rec, show_progress=False) for rec in recs)
+        )
+
+    asyncio.run(run())
+    assert _result_rows(analyzer) == [(rec["id"], 7) for rec in recs]
+
+
+def test_reanalysis_does_not_copy_own_verdict(analyzer):
+    first = _transcript(analyzer, "vid00000001", "same text")
+    second = _transcript(analyzer, "vid00000002", "same text")
+
+    async def run():
+        await analyzer.analyze(first, show_progress=False)
+        await analyzer.analyze(first, show_progress=False)  # no other copy: API again
+        return await analyzer.analyze(second, show_progress=False)
+
+    reused = asyncio.run(run())
+    assert len(analyzer.calls) == 2
+    assert reused.tokens_used is None
+    assert _result_rows(analyzer) == [
+        (first["id"], 7),
+        (first["id"], 7),
+        (second["id"], None),
+    ]
+
+
+def test_analyze_many_caps_concurrency_and_groups_commits(analyzer, monkeypatch):
+    recs = [_transcript(analyzer, f"vid0000000{i}", f"text {i}") for i in range(6)]
+    in_flight = peak = 0
+    commits = []
+    save_bulk = analyzer._save_results_bulk
+
+    def recording(items):
+        commits.append(len(items))
+        save_bulk(items)
+
+    monkeypatch.setattr(analyzer, "_save_results_bulk", recording)
+    create = analyzer._create_response
+
+    async def counting(*args):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await create(*args)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(analyzer, "_create_response", counting)
+    results = asyncio.run(analyzer.analyze_many(recs, 2))
+
+    assert peak == 2
+    assert sum(commits) == 6 and len(commits) < 6
+    assert [r.answer for r in results] == ["No"] * 6
+    assert _result_rows(analyzer) == [(rec["id"], 7) for rec in recs]
+
+
+def test_analyze_pending_skips_analysed_transcripts(analyzer):
+    recs = [_transcript(analyzer, f"vid0000000{i}", f"text {i}") for i in range(5)]
+    asyncio.run(analyzer.analyze(recs[0], show_progress=False))
+    seen = []
+
+    stored = asyncio.run(
+        analyzer.analyze_pending(
+            2, flush_every=2, on_verdict=lambda r, _: seen.append(r["id"])
+        )
+    )
+
+    assert stored == 4
+    assert sorted(seen) == [rec["id"] for rec in recs[1:]]
+    assert _result_rows(analyzer) == [(rec["id"], 7) for rec in recs]
+    assert asyncio.run(analyzer.analyze_pending()) == 0
+
+
+def test_check_many_stored_and_analyzed(analyzer):
+    recs = [_transcript(analyzer, f"vid0000000{i}", f"text {i}") for i in range(2)]
+    asyncio.run(analyzer.analyze(recs[0], show_progress=False))
+    ids = ["vid00000000", "vid00000001", "missing0000"]
+
+    assert analyzer.check_many_stored(ids) == {
+        "vid00000000": True,
+        "vid00000001": True,
+        "missing0000": False,
+    }
+    assert analyzer.check_many_analyzed(ids) == {
+        "vid00000000": True,
+        "vid00000001": False,
+        "missing0000": False,
+    }
@@ -1,43 +1,7 @@
 import logging
-import sys
-from pathlib import Path
-import types
 
 import pytest
 
-# Stub external dependency to avoid requiring actual package during tests
-yt_api = types.ModuleType("youtube_transcript_api")
-yt_api.YouTubeTranscriptApi = object
-sys.modules["youtube_transcript_api"] = yt_api
-errors_mod = types.ModuleType("youtube_transcript_api._errors")
-for name in ["TranscriptsDisabled", "VideoUnavailable", "NoTranscriptFound"]:
-    setattr(errors_mod, name, type(name, (Exception,), {}))
-sys.modules["youtube_transcript_api._errors"] = errors_mod
-
-# Stub minimal config module to satisfy youtube_transcript imports
-config_stub = types.ModuleType("config")
-
-
-class DummySettings:
-    youtube_languages = ["en"]
-    youtube_cookies_path = None
-    https_proxy = None
-    transcripts_dir = Path("./")
-    db_path = Path("./dummy.db")
-
-
-def ensure_dirs_exist() -> None:  # pragma: no cover - no-op for tests
-    pass
-
-
-config_stub.settings = DummySettings()
-config_stub.ensure_dirs_exist = ensure_dirs_exist
-sys.modules["config"] = config_stub
-
-# Ensure repository root and src directory are on the path
-BASE_DIR = Path(__file__).resolve().parents[1]
-sys.path.extend([str(BASE_DIR / "src"), str(BASE_DIR)])
-
 from youtube_transcript import _vtt_to_segments
 
 
@@ -70,3 +34,20 @@ Just text
         segments = _vtt_to_segments(vtt)
     assert len(segments) == 1
     assert any("without timing" in rec.getMessage() for rec in caplog.records)
+
+
+def test_vtt_to_segments_accepts_cue_settings_and_short_timings():
+    vtt = """WEBVTT
+
+1
+00:00:01.000 --> 00:00:03.500 align:start position:0%
+Hello
+world
+
+01:04.000 --> 01:05,000
+Short form
+"""
+    segments = _vtt_to_segments(vtt)
+    assert [s["text"] for s in segments] == ["Hello world", "Short form"]
+    assert segments[0]["duration"] == 2.5
+    assert segments[1]["start"] == 64.0